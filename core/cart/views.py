@@ -1,3 +1,5 @@
+from django.db.models import QuerySet
+
 from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
@@ -5,6 +7,7 @@ from rest_framework.request import Request
 
 from cart.serializers import CartSerializer, CartItemSerializer
 from cart.models import Cart, CartItem
+from product.models import Product
 from components.cart.validators import (
     CreateCartItemValidator,
     CreateCartValidator,
@@ -25,13 +28,30 @@ def _perform_validation(validator):
     return True
 
 
+def _filter_own(queryset: QuerySet, request: Request, owner_lookup: str) -> QuerySet:
+    """Limits queryset to objects of user, staff see all objects."""
+    if request.user.is_staff:
+        return queryset
+    if not request.user.is_authenticated:
+        return queryset.none()
+
+    return queryset.filter(**{owner_lookup: request.user})
+
+
 class CartViewSet(CacheModelViewSet):
     queryset = Cart.objects.select_related('cart_owner').prefetch_related('cartitem_set__product', 'cartitem_set')
     cache_key = "cart"
     timeout = 60 * 2
+    cache_rendered = True
+    cache_dependencies = {CartItem: 'cartitem', Product: 'cartitem__product'}
+    cache_warm_up = False
+    cache_owner_lookup = 'cart_owner'
     serializer_class = CartSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_queryset(self):
+        return _filter_own(super().get_queryset(), self.request, self.cache_owner_lookup)
+
     def get_permissions(self) -> list[permissions.BasePermission]:
         if self.action in constants.SAFE_ACTIONS:
             return [permissions.AllowAny()]
@@ -53,9 +73,15 @@ class CartItemViewSet(CacheModelViewSet):
     queryset = CartItem.objects.select_related('product', 'cart')
     cache_key = "cart_item"
     timeout = 60 * 2
+    cache_dependencies = {Product: 'product'}
+    cache_warm_up = False
+    cache_owner_lookup = 'cart__cart_owner'
     serializer_class = CartItemSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_queryset(self):
+        return _filter_own(super().get_queryset(), self.request, self.cache_owner_lookup)
+
     def get_permissions(self) -> list[permissions.BasePermission]:
         if self.action in constants.SAFE_ACTIONS:
             return [permissions.AllowAny()]
@@ -1,9 +1,38 @@
+import hashlib
+import logging
+import time
+
 from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.exceptions import APIException
 from functools import wraps
 
+from components.general.caching.generations import (
+    get_generation_key,
+    get_prefix_generation_key,
+    get_user_generation_key,
+    get_generation,
+)
+from components.general.caching.query_params import get_query_key
+from components.general.caching.local_cache import local_cache, is_local_cache_available
+from components.general.caching import metrics
+from components.general.constants import (
+    CACHE_LOCK_TIMEOUT,
+    CACHE_LOCK_WAIT,
+    CACHE_LOCK_POLL_INTERVAL,
+)
+
+logger = logging.getLogger('django')
+
+# Headers that are set by renderer on every response, so there's
+# no need to keep them in cache.
+EXCLUDED_HEADERS = {'content-type'}
+
 
 def _get_pk_key(kwargs):
     pk = kwargs.get('pk', '')
@@ -11,13 +40,45 @@ def _get_pk_key(kwargs):
 
 
 def _get_admin_key(request: Request):
+    """Gets namespace of entry, staff and other users can see different
+    querysets (e.g. drafts of products), so their entries never mix.
+    """
     user_is_staff = request.user.is_staff
-    return '_admin' if user_is_staff else ''
+    return '_admin' if user_is_staff else '_public'
+
 
+def _get_user_pk(request: Request, per_user: bool):
+    """Gets user whose own entries are used, `None` if entries are shared."""
+    if not per_user or request.user.is_staff:
+        return None
 
-def _get_page_key(request: Request):
-    page = request.query_params.get("page")
-    return f'_page_{page}' if page else ''
+    return request.user.pk or 'anonymous'
+
+
+def _get_user_key(request: Request, per_user: bool) -> str:
+    user_pk = _get_user_pk(request, per_user)
+    return f'_user_{user_pk}' if user_pk is not None else ''
+
+
+def _get_generation_keys(cache_key: str, kwargs, user_pk=None) -> list[str]:
+    """Gets generation keys of scopes that entry belongs to.
+
+    List belongs to list scope of prefix, or to list scope of user if
+    lists are cached per user. Retrieve belongs to scope of exact object.
+    Both belong to scope of all objects of prefix.
+    """
+    prefix = cache_key.rpartition('_')[0] or cache_key
+    pk = str(kwargs.get('pk', ''))
+    if not pk:
+        if user_pk is not None:
+            return [get_user_generation_key(prefix, user_pk), get_prefix_generation_key(prefix)]
+        return [get_generation_key(prefix)]
+
+    return [get_generation_key(prefix, pk), get_prefix_generation_key(prefix)]
+
+
+def _get_generation(generation_keys: list[str]) -> str:
+    return ':'.join(get_generation(generation_key) for generation_key in generation_keys)
 
 
 def _get_request(args):
@@ -26,16 +87,189 @@ def _get_request(args):
             return arg
 
 
-def get_key(cache_key: str, request: Request, kwargs) -> str:
+def _get_etag(content: bytes) -> str:
+    """Gets weak ETag, it's a hash of body rendered to JSON."""
+    digest = hashlib.md5(content, usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _get_headers(result: Response) -> dict:
+    return {
+        header: value for header, value in result.items()
+        if header.lower() not in EXCLUDED_HEADERS
+    }
+
+
+def _build_entry(result: Response, generation: str) -> dict:
+    """Builds cache entry, body and all metadata are stored under one key."""
+    content = JSONRenderer().render(result.data)
+    return {
+        "body": result.data,
+        "status": result.status_code,
+        "headers": _get_headers(result),
+        "size": len(content),
+        "etag": _get_etag(content),
+        "created_at": time.time(),
+        "generation": generation,
+    }
+
+
+def _build_rendered_entry(request: Request, result: Response, generation: str) -> dict:
+    """Builds cache entry with body rendered by accepted renderer.
+
+    Such entry is returned as is, without unpickling of data structures
+    and rendering them again on every hit.
+    """
+    view = request.parser_context['view']
+    result.accepted_renderer = request.accepted_renderer
+    result.accepted_media_type = request.accepted_media_type
+    result.renderer_context = view.get_renderer_context()
+    content = result.rendered_content
+
+    return {
+        "content": content,
+        "content_type": result['Content-Type'],
+        "status": result.status_code,
+        "headers": _get_headers(result),
+        "size": len(content),
+        "etag": _get_etag(content),
+        "created_at": time.time(),
+        "generation": generation,
+    }
+
+
+def _build_validator(entry: dict) -> dict:
+    """Builds validator of entry, it's stored separately from entry
+    so conditional request doesn't load body.
+    """
+    return {key: entry[key] for key in ("etag", "created_at", "generation")}
+
+
+def _get_validator_headers(entry: dict) -> dict:
+    return {
+        "ETag": entry["etag"],
+        "Last-Modified": http_date(entry["created_at"]),
+    }
+
+
+def _get_entry_response(entry: dict) -> Response | HttpResponse:
+    headers = {**entry["headers"], **_get_validator_headers(entry)}
+    if "content" not in entry:
+        return Response(entry["body"], status=entry["status"], headers=headers)
+
+    return HttpResponse(entry["content"], content_type=entry["content_type"], status=entry["status"], headers=headers)
+
+
+def _get_not_modified_response(validator: dict) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers=_get_validator_headers(validator))
+
+
+def _is_conditional(request: Request) -> bool:
+    return 'If-None-Match' in request.headers or 'If-Modified-Since' in request.headers
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _is_not_modified(request: Request, validator: dict) -> bool:
+    """Checks `If-None-Match` with weak comparison, `If-Modified-Since`
+    is checked only if there's no `If-None-Match`.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or _strip_weak(validator["etag"]) in {_strip_weak(etag) for etag in etags}
+
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(validator["created_at"]) <= since
+
+    return False
+
+
+def _get_conditional_response(request: Request, entry: dict) -> Response | HttpResponse:
+    if _is_not_modified(request, entry):
+        return _get_not_modified_response(entry)
+
+    return _get_entry_response(entry)
+
+
+def _read_entry(key: str, generation_keys: list[str]) -> tuple[dict | None, str | None]:
+    """Reads entry and generations of its scopes with one `get_many`.
+
+    Returns:
+        Entry and combined generation of its scopes, generation is `None`
+        if any of scopes has no generation yet.
+    """
+    cached = cache.get_many([key, *generation_keys])
+    generations = [cached.get(generation_key) for generation_key in generation_keys]
+    if None in generations:
+        return cached.get(key), None
+
+    return cached.get(key), ':'.join(generations)
+
+
+def _is_fresh(entry: dict | None, generation: str | None) -> bool:
+    return entry is not None and generation is not None and entry["generation"] == generation
+
+
+def _is_expired(entry: dict, timeout: int) -> bool:
+    return time.time() - entry["created_at"] >= timeout
+
+
+def _schedule_refresh(request: Request, key: str) -> None:
+    """Schedules background rebuilding of stale entry, only once per entry.
+
+    Marker of scheduled refresh is removed by refresh request, or expires
+    in `CACHE_LOCK_TIMEOUT` seconds if task didn't run.
+    """
+    from components.general.caching.tasks import publish_task, refresh_cache_entry
+
+    refresh_key = key + '_refresh'
+    if not cache.add(refresh_key, 1, CACHE_LOCK_TIMEOUT):
+        return None
+
+    try:
+        publish_task(refresh_cache_entry, {
+            'url': request.build_absolute_uri(),
+            'user_id': request.user.pk,
+            'accept': request.headers.get('Accept', '*/*'),
+        })
+    except Exception as e:
+        cache.delete(refresh_key)
+        logger.warning(f"Can't schedule refresh of cache entry {key}: {e}")
+
+
+def _wait_for_entry(key: str, generation_keys: list[str]) -> dict | None:
+    """Waits while other worker rebuilds entry.
+
+    Returns:
+        Fresh entry or `None` if it wasn't rebuilt in `CACHE_LOCK_WAIT` seconds.
+    """
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+        entry, generation = _read_entry(key, generation_keys)
+        if _is_fresh(entry, generation):
+            return entry
+
+    return None
+
+
+def get_key(cache_key: str, request: Request, kwargs, per_user: bool = False) -> str:
     """Gets full cache key.
 
     Creates different keys based on user permissions since admins can see
-    more fields that default users.
+    more fields that default users. Page, filters, search and ordering
+    are added in canonical form.
 
     Args:
         cache_key: string object of cache key.
         args: Unpacked version of `*args`, should contain `request`.
         kwargs: Unpacked version of `**kwargs`.
+        per_user: Boolean, if True - non-staff users get own keys.
     Returns:
         String object of full key for cache.
     """
@@ -45,20 +279,59 @@ def get_key(cache_key: str, request: Request, kwargs) -> str:
 
     pk = _get_pk_key(kwargs)
     is_admin = _get_admin_key(request)
-    page = _get_page_key(request)
+    user = _get_user_key(request, per_user)
+    query = get_query_key(request)
 
-    key = cache_key + is_admin + pk + page
+    key = cache_key + is_admin + user + pk + query
     return key
 
 
-def cache_method(cache_key: str = None, timeout: int = 60 * 60) -> Response:
+def cache_method(cache_key: str = None,
+                 timeout: int = 60 * 60,
+                 stale_timeout: int | None = None,
+                 local_timeout: int | None = None,
+                 rendered: bool = False,
+                 per_user: bool = False) -> Response:
     """Caches the result of the function using Django's cache.
 
+    Body, status code, headers and generation of response are stored
+    as one entry, so cached read is a single `get_many` of entry and
+    generations of its scopes. Entry built with outdated generation
+    counts as missing.
+
+    Responses have `ETag` and `Last-Modified` headers. Validators are also
+    stored under separate key, so conditional request gets `304` response
+    without loading body.
+
+    Only one worker rebuilds missing entry, others serve outdated entry
+    if there is one or wait `CACHE_LOCK_WAIT` seconds for rebuilt entry.
+
+    With `stale_timeout` entry is kept for `timeout + stale_timeout`
+    seconds. Entry older than `timeout` is still served immediately,
+    but it's rebuilt in background by Celery task.
+
+    With `local_timeout` entry is also kept in memory of worker process
+    for `local_timeout` seconds, so it's served without Redis. Local entries
+    are dropped by invalidation messages from all workers.
+
+    With `rendered` JSON responses are cached as final bytes and returned
+    without rendering.
+
+    With `per_user` every non-staff user gets own entries and own list
+    scope, so change of one user's objects doesn't invalidate lists of
+    other users. View must show only user's own objects.
+
     Args:
         cache_key: String object, should be named as `key_method`. For example:\
             `product_type_retrieve`, `product_type_list`, `user_retrieve`.
         timeout: Integer, the duration for which the result should be cached.\
             Time in `seconds`.
+        stale_timeout: Integer, the duration for which expired result can be\
+            served while it's refreshed. Time in `seconds`.
+        local_timeout: Integer, the duration for which the result should be\
+            cached in worker's memory. Time in `seconds`.
+        rendered: Boolean, if True - JSON response is cached rendered.
+        per_user: Boolean, if True - responses are cached per user.
     Returns:
         `Response` object with cached data and status code.
     """
@@ -67,8 +340,8 @@ def cache_method(cache_key: str = None, timeout: int = 60 * 60) -> Response:
         def wrapper(*args, **kwargs) -> Response:
             """Generates a cache key.
 
-            Cache key generates based on the cache key, users's permissions
-            and PrimaryKey.
+            Cache key generates based on the cache key, users's permissions,
+            PrimaryKey and query params.
 
             Args:
                 *args: Should contain Django's `Request` object named `request`.
@@ -78,23 +351,89 @@ def cache_method(cache_key: str = None, timeout: int = 60 * 60) -> Response:
                 `Response` object with cached data and status code.
             """
             request = _get_request(args)
-            key = get_key(cache_key, request, kwargs)
+            key = get_key(cache_key, request, kwargs, per_user)
+            generation_keys = _get_generation_keys(cache_key, kwargs, _get_user_pk(request, per_user))
+
+            # Only JSON is cached rendered, browsable API gets data.
+            accepted_renderer = getattr(request, 'accepted_renderer', None)
+            is_rendered = rendered and isinstance(accepted_renderer, JSONRenderer)
+            if is_rendered:
+                key += '_rendered'
+
+            # Background refresh always rebuilds entry.
+            is_refresh = getattr(request._request, 'cache_refresh', False)
+            use_local_cache = bool(local_timeout) and is_local_cache_available()
+            if use_local_cache and not is_refresh:
+                if (entry := local_cache.get(key)) is not None:
+                    metrics.HITS.labels(cache_key, 'local').inc()
+                    return _get_conditional_response(request, entry)
+            local_version = local_cache.version
 
-            if request.query_params:
+            validator_key = key + '_validator'
+            if not is_refresh and _is_conditional(request):
+                # Only validator is read, body isn't loaded for `304` response.
+                validator, generation = _read_entry(validator_key, generation_keys)
+                if _is_fresh(validator, generation) and _is_not_modified(request, validator):
+                    if stale_timeout and _is_expired(validator, timeout):
+                        _schedule_refresh(request, key)
+                    metrics.HITS.labels(cache_key, 'not_modified').inc()
+                    return _get_not_modified_response(validator)
+
+            entry, generation = _read_entry(key, generation_keys)
+            if is_refresh:
+                entry = None
+                metrics.BYPASSES.labels(cache_key, 'refresh').inc()
+            elif _is_fresh(entry, generation):
+                if stale_timeout and _is_expired(entry, timeout):
+                    _schedule_refresh(request, key)
+                    metrics.HITS.labels(cache_key, 'stale').inc()
+                else:
+                    metrics.HITS.labels(cache_key, 'redis').inc()
+                    if use_local_cache:
+                        local_cache.set(key, entry, local_timeout, generation_keys, local_version)
+                return _get_conditional_response(request, entry)
+            else:
+                metrics.MISSES.labels(cache_key).inc()
+
+            lock_key = key + '_lock'
+            has_lock = cache.add(lock_key, 1, CACHE_LOCK_TIMEOUT)
+            if not has_lock:
+                # Other worker already rebuilds this entry.
+                if is_refresh:
+                    cache.delete(key + '_refresh')
+                if entry is not None:
+                    metrics.HITS.labels(cache_key, 'outdated').inc()
+                    return _get_conditional_response(request, entry)
+                if (entry := _wait_for_entry(key, generation_keys)) is not None:
+                    metrics.HITS.labels(cache_key, 'coalesced').inc()
+                    return _get_conditional_response(request, entry)
+                metrics.BYPASSES.labels(cache_key, 'lock_timeout').inc()
+
+            try:
+                if generation is None:
+                    generation = _get_generation(generation_keys)
+
+                started_at = time.perf_counter()
                 result = func(*args, **kwargs)
-                return Response(result.data, status=result.status_code)
-
-            cached_data = cache.get(key, None)
-            if cached_data is not None:
-                cached_status_code = cache.get(key + '_status_code')
-                return Response(cached_data, status=cached_status_code)
-
-            result = func(*args, **kwargs)
-            data = result.data
-            status_code = result.status_code
-            cache.set(key, data, timeout)
-            cache.set(key + '_status_code', status_code, timeout)
-            return Response(data, status=status_code)
+                if is_rendered:
+                    entry = _build_rendered_entry(request, result, generation)
+                else:
+                    entry = _build_entry(result, generation)
+                metrics.REBUILD_SECONDS.labels(cache_key).observe(time.perf_counter() - started_at)
+                metrics.PAYLOAD_BYTES.labels(cache_key).observe(entry["size"])
+                cache.set_many({
+                    key: entry,
+                    validator_key: _build_validator(entry),
+                }, timeout + (stale_timeout or 0))
+                if use_local_cache:
+                    local_cache.set(key, entry, local_timeout, generation_keys, local_version)
+            finally:
+                if has_lock:
+                    cache.delete(lock_key)
+                if is_refresh:
+                    cache.delete(key + '_refresh')
+
+            return _get_conditional_response(request, entry)
 
         return wrapper
 
@@ -0,0 +1,61 @@
+import zlib
+
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+
+from components.general.caching import metrics
+from components.general.constants import CACHE_COMPRESS_MIN_LENGTH
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+DECOMPRESSION_ERRORS = (zlib.error, zstandard.ZstdError) if zstandard is not None else (zlib.error,)
+
+
+class ThresholdCompressor(BaseCompressor):
+    """Compresses cache values that are longer than threshold.
+
+    Values are compressed with zstd, or with zlib if `zstandard` isn't
+    installed. Codec is detected by header of value on decompression,
+    so values written with other codec are still readable. Small values
+    and values that don't get smaller are stored as is.
+
+    Options:
+        COMPRESS_MIN_LENGTH: Integer, minimal size of value in bytes
+            that is compressed.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.min_length = int(options.get('COMPRESS_MIN_LENGTH', CACHE_COMPRESS_MIN_LENGTH))
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+
+    def compress(self, value: bytes) -> bytes:
+        if len(value) < self.min_length:
+            return value
+
+        if self.codec == 'zstd':
+            compressed = zstandard.ZstdCompressor().compress(value)
+        else:
+            compressed = zlib.compress(value)
+
+        metrics.COMPRESSION_RATIO.labels(self.codec).observe(len(compressed) / len(value))
+        metrics.COMPRESSION_INPUT_BYTES.labels(self.codec).inc(len(value))
+        if len(compressed) >= len(value):
+            metrics.COMPRESSION_OUTPUT_BYTES.labels(self.codec).inc(len(value))
+            return value
+
+        metrics.COMPRESSION_OUTPUT_BYTES.labels(self.codec).inc(len(compressed))
+        return compressed
+
+    def decompress(self, value: bytes) -> bytes:
+        try:
+            if value.startswith(ZSTD_MAGIC) and zstandard is not None:
+                return zstandard.ZstdDecompressor().decompress(value)
+            return zlib.decompress(value)
+        except DECOMPRESSION_ERRORS as e:
+            # Value wasn't compressed.
+            raise CompressorError(e)
@@ -1,17 +1,34 @@
-from django.core.cache import cache
+from django.conf import settings
+from django.db import transaction
 
-from components.general.constants import CACHE_KEY_REGEX
+from components.general.caching.generations import (
+    get_generation_key,
+    get_prefix_generation_key,
+    get_user_generation_key,
+    bump_generations,
+)
+from components.general.caching.local_cache import publish_invalidation
+from components.general.caching.warm_up import schedule_warm_up
+from components.general.caching import metrics
 
 
 def delete_keys_with_prefix(prefix: str, pk: str) -> None:
     """Deletes cache keys by prefix.
 
-    Provides smart delition using complex RegEx. For example:
-    if we are deleting all cache related to `product` prefix,
-    we won't delete keys with `product_type` prefix.
+    Keys aren't searched and deleted one by one. Every cache entry stores
+    generation of its scope, so we only replace generation of `prefix`
+    list scope and generation of exact object scope. Old entries won't be
+    served anymore and expire by their timeout. This way invalidation
+    costs the same regardless of how many pages are cached. Replaced
+    generations are published to local caches of all workers.
 
-    Also our cache mechanism caches `status code` and `page`
-    number and delete in same way.
+    Inside of transaction generations are replaced once on commit,
+    so bulk changes cause one invalidation instead of one per row.
+    Rolled back changes don't invalidate anything.
+
+    For example: if we are deleting all cache related to `product` prefix,
+    we won't delete keys with `product_type` prefix since they have
+    their own generation.
 
     Args:
         prefix: String object of cache prefix.
@@ -19,15 +36,82 @@ def delete_keys_with_prefix(prefix: str, pk: str) -> None:
             For example: product_retrieve_5
     """
     pk = str(pk)
-    all_keys = cache.keys('*')
-    keys_to_delete = [key for key in all_keys if key.startswith(prefix)]
-    deleted_keys = set()
-    for key in keys_to_delete:
-        if (match := CACHE_KEY_REGEX.match(key)) and (key not in deleted_keys):
-            match_dict = match.groupdict()
-            if not match_dict["prefix"] == prefix:
-                continue
-            if match_dict["pk"] and (not match_dict["pk"] == pk):
-                continue
-            cache.delete(key)
-            deleted_keys.add(key)
+    delete_keys_with_pks(prefix, [pk] if pk else [])
+
+
+def delete_keys_with_pks(prefix: str, pks, user_pks=()) -> None:
+    """Deletes cache keys of list and exact objects of prefix.
+
+    Args:
+        prefix: String object of cache prefix.
+        pks: Iterable of primary keys of cached objects.
+        user_pks: Iterable of primary keys of users whose own lists
+            of prefix are cached separately.
+    """
+    generation_keys = [get_generation_key(prefix)]
+    generation_keys += [get_generation_key(prefix, str(pk)) for pk in pks]
+    generation_keys += [get_user_generation_key(prefix, user_pk) for user_pk in user_pks]
+    _bump_generations(prefix, generation_keys)
+
+
+def delete_all_keys_with_prefix(prefix: str) -> None:
+    """Deletes cache keys of list and all objects of prefix.
+
+    Used when model that all cached objects depend on is changed, for
+    example: renamed `ProductType` changes representation of products.
+
+    Args:
+        prefix: String object of cache prefix.
+    """
+    _bump_generations(prefix, [get_generation_key(prefix), get_prefix_generation_key(prefix)])
+
+
+class _PendingInvalidation:
+    """Generation keys waiting for commit of transaction, by prefix.
+
+    It's registered as `on_commit` callback of transaction and discarded
+    together with rolled back transaction or savepoint where it's
+    registered, so rolled back changes invalidate nothing.
+    """
+
+    def __init__(self) -> None:
+        self.generation_keys: dict[str, set[str]] = {}
+        self.flushed = False
+
+    def __call__(self) -> None:
+        self.flushed = True
+        _flush(self.generation_keys)
+
+
+def _get_pending_invalidation(connection) -> _PendingInvalidation:
+    # Looked up in callbacks of current transaction instead of being stored
+    # aside, so keys of rolled back transaction aren't flushed by next one.
+    for _, callback, *_ in connection.run_on_commit:
+        if isinstance(callback, _PendingInvalidation) and not callback.flushed:
+            return callback
+
+    pending = _PendingInvalidation()
+    transaction.on_commit(pending, using=connection.alias)
+    return pending
+
+
+def _bump_generations(prefix: str, generation_keys: list[str]) -> None:
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _flush({prefix: set(generation_keys)})
+        return None
+
+    pending = _get_pending_invalidation(connection)
+    pending.generation_keys.setdefault(prefix, set()).update(generation_keys)
+
+
+def _flush(pending: dict[str, set[str]]) -> None:
+    """Replaces generations of all prefixes with one `set_many`."""
+    generation_keys = [key for keys in pending.values() for key in keys]
+    bump_generations(generation_keys)
+    publish_invalidation(generation_keys)
+    for prefix in pending:
+        metrics.INVALIDATIONS.labels(prefix).inc()
+
+    if settings.CACHE_WARM_UP_AFTER_INVALIDATION:
+        schedule_warm_up(pending)
@@ -0,0 +1,65 @@
+import uuid
+
+from django.core.cache import cache
+
+from components.general.constants import CACHE_GENERATION_TIMEOUT, GENERATION_KEY_PREFIX
+
+
+def get_generation_key(prefix: str, pk: str = '') -> str:
+    """Gets key of generation scope.
+
+    List responses belong to the scope of their prefix, retrieve responses
+    belong to the scope of exact object. For example:
+    `generation:product` and `generation:product:5`.
+
+    Args:
+        prefix: String object of cache prefix.
+        pk: String object of primary key, empty for list scope.
+    Returns:
+        String object of generation key.
+    """
+    key = f'{GENERATION_KEY_PREFIX}:{prefix}'
+    return f'{key}:{pk}' if pk else key
+
+
+def get_prefix_generation_key(prefix: str) -> str:
+    """Gets key of scope that contains retrieve responses of all objects
+    of prefix, for example: `generation:product:*`. It's replaced when
+    model that every object depends on is changed.
+    """
+    return get_generation_key(prefix, '*')
+
+
+def get_user_generation_key(prefix: str, user_pk) -> str:
+    """Gets key of scope that contains lists of prefix cached for exact
+    user, for example: `generation:cart:user:5`.
+    """
+    return get_generation_key(prefix, f'user:{user_pk}')
+
+
+def _new_generation() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def get_generation(generation_key: str) -> str:
+    """Gets current generation of scope, creates it if it's missing.
+
+    Generation created with `add` so concurrent workers can't
+    overwrite each other's generation. It expires after
+    `CACHE_GENERATION_TIMEOUT`, new generation doesn't match any
+    existing entry, so scope is just invalidated.
+    """
+    generation = cache.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, _new_generation(), timeout=CACHE_GENERATION_TIMEOUT)
+        generation = cache.get(generation_key)
+
+    return generation
+
+
+def bump_generations(generation_keys: list[str]) -> None:
+    """Replaces generations of scopes with one `set_many`, so all entries
+    built with old ones won't be served anymore and will expire by their
+    timeout.
+    """
+    cache.set_many({key: _new_generation() for key in generation_keys}, timeout=CACHE_GENERATION_TIMEOUT)
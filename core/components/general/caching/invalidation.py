@@ -0,0 +1,193 @@
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db.models import Model, ForeignKey
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from components.general.caching.delete_cache_keys import (
+    delete_keys_with_pks,
+    delete_all_keys_with_prefix,
+)
+from components.general.constants import CACHE_INVALIDATION_MAX_OBJECTS
+
+# Maps model to list of `(prefix, cached_model, lookup, owner_lookup)`
+# that depend on it. Lookup leads from cached model to the changed one,
+# `pk` for cached model itself and `None` if relation is unknown.
+_dependencies: dict[type[Model], list[tuple[str, type[Model], str | None, str | None]]] = {}
+
+
+def register_cache_dependencies(prefix: str, model: type[Model], dependencies=(), owner_lookup: str | None = None) -> None:
+    """Registers models that cached responses of prefix depend on.
+
+    Signals are connected only for registered models, so saving of models
+    that aren't cached (sessions, tokens etc.) doesn't invalidate cache.
+
+    Saving of `model` invalidates list and exact object of `prefix`.
+    Saving of dependency invalidates list and only those objects that
+    are related to saved instance, if relation is given. Otherwise
+    all objects of prefix are invalidated.
+
+    Args:
+        prefix: String object of cache prefix. For example: `product`.
+        model: Model class which objects are cached under prefix.
+        dependencies: Dictionary that maps model class displayed in
+            cached responses to lookup from `model` to it, or iterable of
+            model classes if relation is unknown. For example:
+            `{ProductType: 'product_type', Image: 'image'}` for `product`.
+        owner_lookup: String object, lookup from `model` to user that owns
+            object if lists are cached per user. Lists of owners
+            of affected objects are invalidated.
+    """
+    if not isinstance(dependencies, dict):
+        dependencies = dict.fromkeys(dependencies)
+
+    _add_dependency(model, prefix, model, 'pk', owner_lookup)
+    for dependency, lookup in dependencies.items():
+        if dependency is not model:
+            _add_dependency(dependency, prefix, model, lookup, owner_lookup)
+
+
+def _add_dependency(dependency: type[Model],
+                    prefix: str,
+                    model: type[Model],
+                    lookup: str | None,
+                    owner_lookup: str | None) -> None:
+    if dependency not in _dependencies:
+        _dependencies[dependency] = []
+        dispatch_uid = f'cache_invalidation_{dependency._meta.label_lower}'
+        pre_save.connect(_remember_related_pks, sender=dependency, dispatch_uid=dispatch_uid)
+        post_save.connect(invalidate_cache, sender=dependency, dispatch_uid=dispatch_uid)
+        post_delete.connect(invalidate_cache, sender=dependency, dispatch_uid=dispatch_uid)
+
+    _dependencies[dependency].append((prefix, model, lookup, owner_lookup))
+
+
+def _get_foreign_key(model: type[Model], lookup: str | None) -> ForeignKey | None:
+    """Gets foreign key of changed model that points to cached model,
+    for example: `Image.related_to` for `image` lookup of `Product`.
+    """
+    if lookup is None or lookup == 'pk':
+        return None
+
+    try:
+        field = model._meta.get_field(lookup)
+    except FieldDoesNotExist:
+        return None
+
+    return field.field if field.one_to_many else None
+
+
+def _remember_related_pks(sender, instance, **kwargs) -> None:
+    """Remembers cached objects that updated instance was related to
+    before saving, they are outdated too if relation is changed.
+    """
+    if instance._state.adding or instance.pk is None:
+        return None
+
+    attnames = {
+        foreign_key.attname for _, model, lookup, _ in _dependencies[sender]
+        if (foreign_key := _get_foreign_key(model, lookup)) is not None
+    }
+    if attnames:
+        instance._cache_related_pks = sender.objects.filter(pk=instance.pk).values(*attnames).first() or {}
+
+
+def _get_affected_pks(model: type[Model], lookup: str | None, instance: Model, is_deleted: bool):
+    """Gets primary keys of cached objects that display changed instance.
+
+    Returns:
+        Set of primary keys or `None` if all objects are affected.
+    """
+    if lookup == 'pk':
+        return {instance.pk}
+
+    foreign_key = _get_foreign_key(model, lookup)
+    if foreign_key is not None:
+        pks = {getattr(instance, foreign_key.attname)}
+        pks.add(getattr(instance, '_cache_related_pks', {}).get(foreign_key.attname))
+        pks.discard(None)
+        return pks
+
+    # Related rows are already detached from deleted instance.
+    if lookup is None or is_deleted:
+        return None
+
+    pks = set(
+        model.objects.filter(**{lookup: instance.pk})
+        .values_list('pk', flat=True)
+        .distinct()[:CACHE_INVALIDATION_MAX_OBJECTS + 1]
+    )
+    return None if len(pks) > CACHE_INVALIDATION_MAX_OBJECTS else pks
+
+
+def _get_owner_pks(model: type[Model], owner_lookup: str, instance: Model, pks: set):
+    """Gets users whose own lists display affected objects.
+
+    Returns:
+        Set of primary keys of users or `None` if owner can't be found.
+    """
+    if not isinstance(instance, model):
+        return set(
+            model.objects.filter(pk__in=pks, **{f'{owner_lookup}__isnull': False})
+            .values_list(owner_lookup, flat=True)
+            .distinct()
+        )
+
+    # Instance can be already deleted, so owner is taken from it.
+    *path, field_name = owner_lookup.split('__')
+    owner = instance
+    try:
+        for name in path:
+            if (owner := getattr(owner, name)) is None:
+                return set()
+    except ObjectDoesNotExist:
+        return None
+
+    owner_pk = getattr(owner, owner._meta.get_field(field_name).attname)
+    return set() if owner_pk is None else {owner_pk}
+
+
+def invalidate_cache(sender, instance, signal, **kwargs) -> None:
+    """Invalidates cache of objects that display saved or deleted instance.
+
+    Args:
+        sender: signal sender, a instance of Django's model.
+        instance: exact instance that sends signal.
+        signal: `post_save` or `post_delete` signal.
+        **kwargs: keyword arguments enforced by signal.
+    """
+    is_deleted = signal is post_delete
+    for prefix, model, lookup, owner_lookup in _dependencies.get(sender, []):
+        pks = _get_affected_pks(model, lookup, instance, is_deleted)
+        owner_pks = set()
+        if pks and owner_lookup is not None:
+            owner_pks = _get_owner_pks(model, owner_lookup, instance, pks)
+
+        if pks is None or owner_pks is None:
+            delete_all_keys_with_prefix(prefix)
+        elif pks:
+            delete_keys_with_pks(prefix, pks, owner_pks)
+
+
+def invalidate_cache_of_objects(model: type[Model], pks) -> None:
+    """Invalidates cache of objects that were changed without signals,
+    for example: by `QuerySet.update()`.
+
+    Args:
+        model: Model class of changed objects.
+        pks: Iterable of primary keys of changed objects.
+    """
+    if model not in _dependencies:
+        return None
+
+    for instance in model.objects.filter(pk__in=pks):
+        invalidate_cache(model, instance, post_save)
+
+
+def invalidate_cache_of_model(model: type[Model]) -> None:
+    """Invalidates all cache that depends on model, for example: after
+    bulk update of all its objects.
+
+    Args:
+        model: Model class of changed objects.
+    """
+    for prefix in {prefix for prefix, *_ in _dependencies.get(model, [])}:
+        delete_all_keys_with_prefix(prefix)
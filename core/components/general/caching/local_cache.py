@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django_redis import get_redis_connection
+
+from components.general.constants import (
+    CACHE_INVALIDATION_CHANNEL,
+    LOCAL_CACHE_MAX_SIZE,
+    LOCAL_CACHE_RECONNECT_INTERVAL,
+)
+
+logger = logging.getLogger('django')
+
+
+class LocalCache:
+    """Bounded LRU cache with TTL that lives in memory of worker process.
+
+    Every entry remembers generation keys of its scopes, so entries are
+    dropped by the same generation keys that are replaced on invalidation.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        # Increases on every invalidation, entry read from Redis before
+        # invalidation must not be stored after it.
+        self.version = 0
+        self._entries: OrderedDict[str, tuple[float, tuple[str, ...], dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            expires_at, _, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict, timeout: int, generation_keys: list[str], version: int) -> None:
+        with self._lock:
+            if version != self.version:
+                return None
+
+            self._entries[key] = (time.monotonic() + timeout, tuple(generation_keys), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, generation_keys: list[str]) -> None:
+        generation_keys = set(generation_keys)
+        with self._lock:
+            self.version += 1
+            for key, (_, entry_generation_keys, _) in list(self._entries.items()):
+                if not generation_keys.isdisjoint(entry_generation_keys):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+local_cache = LocalCache(max_size=LOCAL_CACHE_MAX_SIZE)
+
+_listener_started = False
+_listener_lock = threading.Lock()
+_is_listening = threading.Event()
+
+
+def _listen() -> None:
+    """Drops local entries by invalidation messages of all workers.
+
+    While there's no connection to Redis messages can be missed,
+    so local cache is cleared and not used until reconnect.
+    """
+    while True:
+        pubsub = None
+        try:
+            pubsub = get_redis_connection('default').pubsub()
+            pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                if message['type'] == 'subscribe':
+                    _is_listening.set()
+                elif message['type'] == 'message':
+                    data = message['data']
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    local_cache.invalidate(data.split(','))
+        except Exception as e:
+            logger.warning(f"Local cache invalidation listener disconnected: {e}")
+        finally:
+            if pubsub is not None:
+                pubsub.close()
+
+        _is_listening.clear()
+        local_cache.clear()
+        time.sleep(LOCAL_CACHE_RECONNECT_INTERVAL)
+
+
+def is_local_cache_available() -> bool:
+    """Checks that worker receives invalidation messages.
+
+    Listener thread starts on first call, so it's started in every
+    worker after fork. Cache backends without pub/sub never
+    use local cache.
+    """
+    global _listener_started
+
+    if not _listener_started:
+        with _listener_lock:
+            if not _listener_started:
+                _listener_started = True
+                try:
+                    get_redis_connection('default')
+                except NotImplementedError:
+                    return False
+
+                threading.Thread(target=_listen, name='local-cache-listener', daemon=True).start()
+
+    return _is_listening.is_set()
+
+
+def publish_invalidation(generation_keys: list[str]) -> None:
+    """Sends replaced generation keys to local caches of all workers."""
+    local_cache.invalidate(generation_keys)
+    try:
+        get_redis_connection('default').publish(CACHE_INVALIDATION_CHANNEL, ','.join(generation_keys))
+    except NotImplementedError:
+        pass
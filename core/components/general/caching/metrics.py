@@ -0,0 +1,58 @@
+import os
+
+from prometheus_client import Counter, Histogram
+
+# In multiprocess mode every process writes metrics to files in this
+# directory. Gunicorn master cleans it on start, other processes (Celery
+# worker, management commands, runserver) only need it to exist.
+if multiproc_dir := os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+COMPRESSION_RATIO = Histogram(
+    'cache_compression_ratio',
+    'Compressed size of cache value divided by its original size.',
+    ['codec'],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+COMPRESSION_INPUT_BYTES = Counter(
+    'cache_compression_input_bytes',
+    'Size of cache values before compression.',
+    ['codec'],
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    'cache_compression_output_bytes',
+    'Size of cache values after compression.',
+    ['codec'],
+)
+
+HITS = Counter(
+    'cache_hits',
+    'Responses served from cache.',
+    ['cache_key', 'source'],
+)
+MISSES = Counter(
+    'cache_misses',
+    'Responses that were missing in cache or outdated.',
+    ['cache_key'],
+)
+BYPASSES = Counter(
+    'cache_bypasses',
+    'Responses built without reading or writing cache.',
+    ['cache_key', 'reason'],
+)
+REBUILD_SECONDS = Histogram(
+    'cache_rebuild_seconds',
+    'Time spent on building response that is stored in cache.',
+    ['cache_key'],
+)
+PAYLOAD_BYTES = Histogram(
+    'cache_payload_bytes',
+    'Size of rendered response that is stored in cache.',
+    ['cache_key'],
+    buckets=(1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+INVALIDATIONS = Counter(
+    'cache_invalidations',
+    'Invalidations of cache prefix.',
+    ['prefix'],
+)
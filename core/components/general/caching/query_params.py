@@ -0,0 +1,87 @@
+import hashlib
+
+from rest_framework.request import Request
+
+# Query params names that affect response of view class and action,
+# actions can have own filter backends and params.
+_view_query_params: dict[tuple[type, str | None], frozenset[str]] = {}
+
+
+def _get_backend_params(backend, view) -> list[str]:
+    if hasattr(backend, 'get_filterset_class'):
+        # django-filter's schema generation is deprecated,
+        # so names are taken from filterset directly.
+        filterset_class = backend.get_filterset_class(view, view.get_queryset())
+        return list(filterset_class.base_filters) if filterset_class else []
+
+    return [param['name'] for param in backend.get_schema_operation_parameters(view)]
+
+
+def get_view_query_params(view) -> frozenset[str]:
+    """Gets names of query params that affect response of view.
+
+    Names are collected from view's filter backends, paginator and
+    `cache_query_params` attribute. Other params are ignored by view,
+    so they shouldn't create new cache entries.
+
+    Args:
+        view: DRF's view instance.
+    Returns:
+        Frozen set of query params names.
+    """
+    view_key = (type(view), getattr(view, 'action', None))
+    if view_key not in _view_query_params:
+        params = set(getattr(view, 'cache_query_params', []))
+        for backend in getattr(view, 'filter_backends', []):
+            params.update(_get_backend_params(backend(), view))
+
+        paginator = getattr(view, 'paginator', None)
+        if paginator is not None:
+            params.update(_get_backend_params(paginator, view))
+
+        _view_query_params[view_key] = frozenset(params)
+
+    return _view_query_params[view_key]
+
+
+def get_query_key(request: Request) -> str:
+    """Gets canonical part of cache key for query params.
+
+    Params are sorted, empty params and params that don't affect response
+    are dropped and values are normalized by view's `cache_query_normalizers`
+    so `?ordering=price&product_type=2,1` and `?product_type=1,2&ordering=price`
+    share one entry. Page stays readable in key, other params are hashed.
+
+    Args:
+        request: DRF's `Request` object.
+    Returns:
+        String object of query part of cache key, empty if there
+        are no params that affect response.
+    """
+    view = request.parser_context.get('view') if request.parser_context else None
+    query_params = request.query_params
+    if view is None:
+        allowed_params = frozenset(query_params)
+        normalizers = {}
+    else:
+        allowed_params = get_view_query_params(view)
+        normalizers = getattr(view, 'cache_query_normalizers', {})
+
+    page_param = getattr(getattr(view, 'paginator', None), 'page_query_param', 'page')
+    page = query_params.get(page_param)
+    key = f'_page_{page}' if page and page != '1' else ''
+
+    canonical = []
+    for name in sorted(allowed_params & query_params.keys() - {page_param}):
+        value = query_params.get(name)
+        if not value:
+            continue
+        if name in normalizers:
+            value = normalizers[name](value)
+        canonical.append(f'{name}={value}')
+
+    if canonical:
+        digest = hashlib.sha1('&'.join(canonical).encode()).hexdigest()[:16]
+        key += f'_query_{digest}'
+
+    return key
@@ -0,0 +1,74 @@
+import logging
+
+from celery import shared_task
+
+from components.general.caching.warm_up import replay_request, warm_up_cache
+from components.general.constants import CACHE_TASK_PUBLISH_TIMEOUT, CACHE_WARM_UP_PAGES
+from user.models import User
+
+logger = logging.getLogger('django')
+
+
+def publish_task(task, kwargs: dict, countdown: int | None = None) -> None:
+    """Sends task to broker without blocking caller for long.
+
+    Connecting and every call to broker is given `CACHE_TASK_PUBLISH_TIMEOUT`
+    seconds and sending isn't retried, so slow or unavailable broker
+    doesn't hold request.
+
+    Args:
+        task: Celery task.
+        kwargs: Dictionary of keyword arguments of task.
+        countdown: Integer, delay in seconds before task is executed.
+    Raises:
+        Exception if broker is unavailable.
+    """
+    if task.app.conf.task_always_eager:
+        task.apply_async(kwargs=kwargs, countdown=countdown)
+        return None
+
+    timeout = CACHE_TASK_PUBLISH_TIMEOUT
+    transport_options = {'socket_connect_timeout': timeout, 'socket_timeout': timeout}
+    with task.app.connection_for_write(connect_timeout=timeout, transport_options=transport_options) as connection:
+        connection.ensure_connection(max_retries=1, interval_start=0, timeout=timeout)
+        task.apply_async(kwargs=kwargs, countdown=countdown, connection=connection, retry=False)
+
+
+@shared_task
+def refresh_cache_entry(url: str, user_id: int | None = None, accept: str = '*/*') -> None:
+    """Rebuilds stale cache entry in background.
+
+    Replays `GET` request to cached endpoint on behalf of the same user,
+    `cache_method` sees `cache_refresh` flag and rebuilds entry without
+    reading it.
+
+    Args:
+        url: String object of absolute URL of stale request,
+            host and scheme are needed to build same hyperlinks.
+        user_id: Integer, id of user that requested stale entry,
+            `None` for anonymous user.
+        accept: String object, `Accept` header of stale request, entries
+            are rendered by accepted renderer.
+    """
+    user = None
+    if user_id is not None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+
+    response = replay_request(url, user, accept, refresh=True)
+    if response.status_code >= 400:
+        logger.warning(f"Cache refresh of {url} failed with code {response.status_code}")
+
+
+@shared_task
+def warm_cache(prefixes: list[str] | None = None, pages: int = CACHE_WARM_UP_PAGES) -> int:
+    """Populates cache of first pages of cached viewsets.
+
+    Args:
+        prefixes: List of cache prefixes to warm up, `None` for all.
+        pages: Integer, number of pages of every list.
+    Returns:
+        Integer, number of requested pages.
+    """
+    return warm_up_cache(prefixes, pages)
@@ -1,8 +1,10 @@
 from components.general.caching.cache import cache_method
+from components.general.caching.invalidation import register_cache_dependencies
+from components.general.sparse_fields import SparseFieldsetMixin
 from rest_framework.viewsets import ModelViewSet
 
 
-class CacheModelViewSet(ModelViewSet):
+class CacheModelViewSet(SparseFieldsetMixin, ModelViewSet):
     """Provides default cache realisation for `retrieve` and `list` methods
 
     Class provides cache realisation for `retrieve` and `list` methods
@@ -11,12 +13,61 @@ class CacheModelViewSet(ModelViewSet):
     To use this class just create attributes in ViewSet called `cache_key` and `timeout`
     and specify values for them.
 
+    Listings with filters, search, ordering and pagination are cached too,
+    optional `cache_query_normalizers` attribute maps query param name to
+    function that normalizes its value for cache key. Params that aren't
+    handled by filter backends or paginator, for example params of extra
+    actions, are listed in `cache_query_params`.
+
+    Optional `stale_timeout` attribute enables stale-while-revalidate mode,
+    expired entry is served for `stale_timeout` more seconds while it's
+    refreshed in background.
+
+    Optional `local_timeout` attribute keeps entries in memory of worker
+    process too, it's useful for small and rarely changed tables.
+
+    Optional `cache_rendered` attribute caches JSON responses as rendered
+    bytes.
+
+    Cache is invalidated when model of `queryset` is saved or deleted.
+    Optional `cache_dependencies` attribute maps other models that are
+    displayed in responses to lookups from model of `queryset`, their
+    changes invalidate cache of related objects only.
+
+    Optional `cache_owner_lookup` attribute is a lookup from model of
+    `queryset` to user that owns object. With it non-staff users get own
+    cache entries and change of object invalidates only lists of its
+    owner. Queryset must be limited to user's own objects.
+
+    Responses contain only fields requested with `?fields=`.
+
+    First pages of lists are populated by `warm_cache` command, private
+    viewsets can disable it with `cache_warm_up = False`.
+
     Base args:
         default_cache_key: ''
         default_timeout: 25
+        default_stale_timeout: None
+        default_local_timeout: None
     """
     default_cache_key = ''
     default_timeout = 25
+    default_stale_timeout = None
+    default_local_timeout = None
+    cache_rendered = False
+    cache_dependencies = {}
+    cache_warm_up = True
+    cache_owner_lookup = None
+    cache_query_params = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cache_key = getattr(cls, 'cache_key', cls.default_cache_key)
+        if cache_key and cls.queryset is not None:
+            register_cache_dependencies(cache_key,
+                                        cls.queryset.model,
+                                        cls.cache_dependencies,
+                                        cls.cache_owner_lookup)
 
     def retrieve(self, request, *args, **kwargs):
         cache_key = getattr(
@@ -39,4 +90,11 @@ class CacheModelViewSet(ModelViewSet):
         return self.cached_method_wrapper(super().list, cache_key=cache_key, timeout=timeout)(request, *args, **kwargs)
 
     def cached_method_wrapper(self, func, cache_key, timeout):
-        return cache_method(cache_key=cache_key, timeout=timeout)(func)
+        stale_timeout = getattr(self, 'stale_timeout', self.default_stale_timeout)
+        local_timeout = getattr(self, 'local_timeout', self.default_local_timeout)
+        return cache_method(cache_key=cache_key,
+                            timeout=timeout,
+                            stale_timeout=stale_timeout,
+                            local_timeout=local_timeout,
+                            rendered=self.cache_rendered,
+                            per_user=self.cache_owner_lookup is not None)(func)
@@ -0,0 +1,153 @@
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http.request import split_domain_port, validate_host
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from rest_framework.response import Response
+
+from components.general.constants import CACHE_WARM_UP_DELAY, CACHE_WARM_UP_PAGES
+
+logger = logging.getLogger('django')
+
+
+def replay_request(url: str, user=None, accept: str = '*/*', refresh: bool = False):
+    """Replays `GET` request to endpoint on behalf of user.
+
+    Args:
+        url: String object of absolute URL, host and scheme are needed
+            to build same hyperlinks as in requests of clients.
+        user: `User` instance or `None` for anonymous user.
+        accept: String object, `Accept` header of request.
+        refresh: Boolean, if True - `cache_method` rebuilds entry
+            without reading it.
+    Returns:
+        Response of view.
+    """
+    parts = urlsplit(url)
+    request = RequestFactory().get(
+        parts.path,
+        QUERY_STRING=parts.query,
+        HTTP_HOST=parts.netloc,
+        HTTP_ACCEPT=accept,
+        secure=parts.scheme == 'https',
+    )
+    request.cache_refresh = refresh
+    if user is not None:
+        request._force_auth_user = user
+
+    match = resolve(parts.path)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+def _get_warm_up_viewsets(prefixes=None) -> list[tuple[str, str]]:
+    """Gets cached viewsets of API router that can be warmed up.
+
+    Returns:
+        List of `(cache_key, basename)` pairs.
+    """
+    from components.general.caching.viewsets import CacheModelViewSet
+    from core.router import router
+
+    viewsets = []
+    for _, viewset, basename in router.registry:
+        if not issubclass(viewset, CacheModelViewSet) or not viewset.cache_warm_up:
+            continue
+        cache_key = getattr(viewset, 'cache_key', viewset.default_cache_key)
+        if prefixes is None or cache_key in prefixes:
+            viewsets.append((cache_key, basename))
+
+    return viewsets
+
+
+def _has_next_page(response) -> bool:
+    data = response.data if isinstance(response, Response) else json.loads(response.content)
+    return isinstance(data, dict) and bool(data.get('next'))
+
+
+def get_warm_up_url() -> str:
+    """Gets public base URL of API that cache is warmed up with.
+
+    Raises:
+        ImproperlyConfigured: If `CACHE_WARM_UP_URL` isn't set or its host
+            isn't in `ALLOWED_HOSTS`, replayed requests would fail
+            or cache hyperlinks that clients can't open.
+    Returns:
+        String object of URL without trailing slash.
+    """
+    url = settings.CACHE_WARM_UP_URL
+    if not url:
+        raise ImproperlyConfigured("CACHE_WARM_UP_URL must be set to public URL of API to warm up cache.")
+
+    host, _ = split_domain_port(urlsplit(url).netloc)
+    if not validate_host(host, settings.ALLOWED_HOSTS):
+        raise ImproperlyConfigured(f"Host of CACHE_WARM_UP_URL {url} isn't in ALLOWED_HOSTS.")
+
+    return url.rstrip('/')
+
+
+def warm_up_cache(prefixes=None, pages: int = CACHE_WARM_UP_PAGES) -> int:
+    """Populates cache of first pages of cached viewsets.
+
+    Pages are requested as JSON for anonymous user and for staff user,
+    so both variants of cache key are built. Existing fresh entries
+    are just read.
+
+    Args:
+        prefixes: Iterable of cache prefixes to warm up, `None` for all.
+        pages: Integer, number of pages of every list.
+    Raises:
+        ImproperlyConfigured: If `CACHE_WARM_UP_URL` isn't valid.
+    Returns:
+        Integer, number of requested pages.
+    """
+    from user.models import User
+
+    base_url = get_warm_up_url()
+
+    users = [None]
+    if (admin := User.objects.filter(is_staff=True, is_active=True).first()) is not None:
+        users.append(admin)
+
+    warmed = 0
+    for cache_key, basename in _get_warm_up_viewsets(prefixes):
+        url = base_url + reverse(f'{basename}-list')
+        for user in users:
+            for page in range(1, pages + 1):
+                page_url = url if page == 1 else f'{url}?page={page}'
+                response = replay_request(page_url, user, 'application/json')
+                warmed += 1
+                if response.status_code != 200:
+                    logger.warning(f"Cache warm up of {page_url} failed with code {response.status_code}")
+                    break
+                if not _has_next_page(response):
+                    break
+
+    return warmed
+
+
+def schedule_warm_up(prefixes) -> None:
+    """Schedules warm up of invalidated prefixes.
+
+    Warm up starts after `CACHE_WARM_UP_DELAY` seconds, invalidations
+    of the same prefix within this time are warmed up once.
+    """
+    from components.general.caching.tasks import publish_task, warm_cache
+
+    if not settings.CACHE_WARM_UP_URL:
+        logger.warning(f"Cache warm up of {list(prefixes)} is skipped, CACHE_WARM_UP_URL isn't set")
+        return None
+
+    prefixes = [prefix for prefix in prefixes if cache.add(f'warm_up:{prefix}', 1, CACHE_WARM_UP_DELAY)]
+    if not prefixes:
+        return None
+
+    try:
+        publish_task(warm_cache, {'prefixes': prefixes}, countdown=CACHE_WARM_UP_DELAY)
+    except Exception as e:
+        cache.delete_many([f'warm_up:{prefix}' for prefix in prefixes])
+        logger.warning(f"Can't schedule cache warm up of {prefixes}: {e}")
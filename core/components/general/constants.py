@@ -1,8 +1,45 @@
-import re
-
-# Simplified: prefix_method_admin?_pk?_page_{number}?_status_code?
-# `?` means optional.
-CACHE_KEY_REGEX = re.compile(
-    r"^(?P<prefix>[a-zA-Z0-9_]+)(?:_(?P<method>list|retrieve))(?:_(?P<admin>admin))?"
-    r"(?:_(?P<pk>\d+))?(?:_(?P<page>_\d+))?(?:_(?P<status_code>\w+))?$"
-)
+# Generation keys look like: generation:prefix, generation:prefix:pk
+# or generation:prefix:* for all objects of prefix
+GENERATION_KEY_PREFIX = 'generation'
+# Generation keys expire after this time in seconds, so keys of deleted
+# objects and users don't stay in cache forever. It's longer than timeout
+# of any cache entry, lost generation just invalidates its scope.
+CACHE_GENERATION_TIMEOUT = 60 * 60 * 24 * 2
+
+# Single-flight lock for rebuilding of cache entry, time in seconds.
+# Lock expires by itself if worker died while rebuilding entry.
+CACHE_LOCK_TIMEOUT = 10
+# How long other workers wait for rebuilt entry before building it themselves.
+CACHE_LOCK_WAIT = 2
+CACHE_LOCK_POLL_INTERVAL = 0.05
+# Background tasks are sent from request path, if broker doesn't respond
+# within this time in seconds task isn't sent.
+CACHE_TASK_PUBLISH_TIMEOUT = 1
+
+# In-process cache in front of Redis, invalidated by messages in channel.
+CACHE_INVALIDATION_CHANNEL = 'cache_invalidation'
+LOCAL_CACHE_MAX_SIZE = 256
+LOCAL_CACHE_RECONNECT_INTERVAL = 5
+
+# Cache values shorter than this size in bytes are stored uncompressed.
+CACHE_COMPRESS_MIN_LENGTH = 1024
+
+# If change of related model affects more cached objects than this,
+# all objects of prefix are invalidated instead of each of them.
+CACHE_INVALIDATION_MAX_OBJECTS = 1000
+
+# Cache warm up: number of list pages that are populated and delay
+# in seconds between invalidation and warm up of prefix.
+CACHE_WARM_UP_PAGES = 3
+CACHE_WARM_UP_DELAY = 10
+
+# Pagination counts: filtered counts are cached for this time in seconds,
+# unfiltered tables larger than this number of rows are counted by estimate.
+PAGINATION_COUNT_TIMEOUT = 60
+PAGINATION_ESTIMATE_MIN_COUNT = 100000
+# Largest page size that client can request with `?page_size=`.
+PAGINATION_MAX_PAGE_SIZE = 100
+
+# Product autocomplete: default and largest number of suggestions.
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
@@ -0,0 +1,262 @@
+import hashlib
+from collections import OrderedDict
+from functools import partial
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator as DjangoPaginator, EmptyPage
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.response import Response
+
+from components.general.caching.generations import get_generation_key, get_generation
+from components.general.constants import (
+    PAGINATION_COUNT_TIMEOUT,
+    PAGINATION_ESTIMATE_MIN_COUNT,
+    PAGINATION_MAX_PAGE_SIZE,
+)
+
+
+def _get_estimated_count(queryset: QuerySet) -> int | None:
+    """Gets number of rows of table from Postgres statistics.
+
+    Returns:
+        Integer or `None` if estimate isn't available or table is small
+        enough to be counted exactly.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                       [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+
+    if row is None or row[0] < PAGINATION_ESTIMATE_MIN_COUNT:
+        return None
+    return int(row[0])
+
+
+def get_count(object_list, scope: str = '') -> int:
+    """Gets number of objects for pagination.
+
+    Unfiltered querysets of large tables are counted by Postgres estimate,
+    counts of filtered querysets are cached by their SQL for
+    `PAGINATION_COUNT_TIMEOUT` seconds.
+
+    Args:
+        object_list: Queryset or list of objects.
+        scope: String object, counts are cached separately for every
+            scope. Generation of cached list is used, so counts are
+            outdated together with cached pages.
+    Returns:
+        Integer, exact or estimated number of objects.
+    """
+    if not isinstance(object_list, QuerySet):
+        return len(object_list)
+
+    query = object_list.query
+    if query.is_empty():
+        return 0
+
+    if not query.where and not query.distinct:
+        if (estimate := _get_estimated_count(object_list)) is not None:
+            return estimate
+
+    key = f'pagination_count:{scope}:' + hashlib.sha1(str(query).encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = object_list.count()
+        cache.set(key, count, PAGINATION_COUNT_TIMEOUT)
+
+    return count
+
+
+class CachedCountPaginator(DjangoPaginator):
+    """Django paginator with count from `get_count`."""
+
+    def __init__(self, *args, count_scope: str = '', **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.count_scope = count_scope
+
+    @cached_property
+    def count(self) -> int:
+        return get_count(self.object_list, self.count_scope)
+
+
+class UncountedPaginator(DjangoPaginator):
+    """Django paginator that doesn't count objects.
+
+    One object more than page size is fetched to know if there's next
+    page, count is set to number of objects seen so far.
+    """
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+
+        self.count = bottom + len(objects)
+        return self._get_page(objects[:self.per_page], number, self)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            number = 0
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """Page number pagination without exact `COUNT(*)` on every request.
+
+    Count comes from `get_count`, so it can be estimated or up to
+    `PAGINATION_COUNT_TIMEOUT` seconds old. With `?count=false` objects
+    aren't counted at all and response has no `count`, it's meant for
+    infinite scroll.
+
+    Page size can be set with `?page_size=`, up to `PAGINATION_MAX_PAGE_SIZE`.
+    """
+    django_paginator_class = CachedCountPaginator
+    count_query_param = 'count'
+    page_size_query_param = 'page_size'
+    max_page_size = PAGINATION_MAX_PAGE_SIZE
+
+    def _is_counted(self, request) -> bool:
+        return request.query_params.get(self.count_query_param, '').lower() not in ('false', '0')
+
+    def _get_count_scope(self, view) -> str:
+        # Any change of cached objects replaces generation of list.
+        cache_key = getattr(view, 'cache_key', None)
+        return get_generation(get_generation_key(cache_key)) if cache_key else ''
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.is_counted = self._is_counted(request)
+        if self.is_counted:
+            self.django_paginator_class = partial(CachedCountPaginator, count_scope=self._get_count_scope(view))
+        else:
+            self.django_paginator_class = UncountedPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.is_counted:
+            return super().get_paginated_response(data)
+
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to `false` to skip counting of objects.',
+                'schema': {
+                    'type': 'boolean',
+                },
+            },
+        ]
+
+
+class StableCursorPagination(CursorPagination):
+    """Cursor pagination over `-id` or ordering chosen by `OrderingFilter`.
+
+    Cursor position is taken from the first ordering field, objects with
+    equal position are skipped by offset. `id` is added to ordering so
+    such objects always come in the same order and cursors stay stable
+    for non-unique fields like `price`.
+
+    Position of cursor can't be `NULL`, so nullable fields can't be used.
+    """
+    ordering = '-id'
+
+    def get_ordering(self, request, queryset, view) -> tuple:
+        ordering = super().get_ordering(request, queryset, view)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering += ('-id',)
+
+        for field in ordering:
+            name = field.lstrip('-')
+            try:
+                nullable = queryset.model._meta.get_field(name).null
+            except FieldDoesNotExist:
+                continue
+            if nullable:
+                raise ValidationError({'ordering': f"Field '{name}' can't be used with cursor pagination."})
+
+        return ordering
+
+
+class OptionalCursorPagination(ApproximateCountPagination):
+    """Page number pagination with opt-in cursor mode.
+
+    Cursor mode is used with `?pagination=cursor` or if request has
+    `cursor` param (links to next and previous pages). It doesn't count
+    objects and doesn't use `OFFSET`, so it's suitable for long lists
+    and infinite scroll. Response has `next`, `previous` and `results`.
+    """
+    mode_query_param = 'pagination'
+    cursor_pagination_class = StableCursorPagination
+
+    def __init__(self) -> None:
+        self.cursor_paginator = None
+
+    def _is_cursor_mode(self, request) -> bool:
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        return request.query_params.get(self.mode_query_param) == 'cursor' or cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._is_cursor_mode(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            self.cursor_paginator.page_size = self.get_page_size(request)
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            *self.cursor_pagination_class().get_schema_operation_parameters(view),
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to `cursor` to paginate by cursor.',
+                'schema': {
+                    'type': 'string',
+                    'enum': ['page', 'cursor'],
+                },
+            },
+        ]
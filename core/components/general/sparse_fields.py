@@ -0,0 +1,92 @@
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def get_requested_fields(request) -> set[str] | None:
+    """Gets names of fields from `?fields=id,title,price`.
+
+    Returns:
+        Set of field names or `None` if all fields are requested.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+
+    value = request.query_params.get(FIELDS_QUERY_PARAM, '')
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    return fields or None
+
+
+def normalize_fields(value: str) -> str:
+    """Normalizes list of fields, so `title,id` and `id,title,id`
+    give the same value."""
+    return ','.join(sorted({name.strip() for name in value.split(',') if name.strip()}))
+
+
+class SparseFieldsetFilter(BaseFilterBackend):
+    """Loads only columns of fields requested with `?fields=`.
+
+    Concrete fields that aren't requested are deferred, foreign keys are
+    always loaded since representation and `select_related` rely on them.
+    Prefetches of relations that aren't requested are dropped.
+    Unknown field names are ignored.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        fields = get_requested_fields(request)
+        if fields is None:
+            return queryset
+
+        serializer_fields = view.get_serializer_class()().fields
+        sources = {
+            field.source.split('.')[0] for name, field in serializer_fields.items()
+            if name in fields
+        }
+        if not sources:
+            return queryset
+
+        model = queryset.model
+        columns = [
+            field.name for field in model._meta.concrete_fields
+            if field.primary_key or field.is_relation or field.name in sources
+        ]
+        prefetches = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, 'prefetch_through', lookup).split('__')[0] in sources
+        ]
+        return queryset.only(*columns).prefetch_related(None).prefetch_related(*prefetches)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': FIELDS_QUERY_PARAM,
+                'required': False,
+                'in': 'query',
+                'description': 'Comma separated names of fields to return.',
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
+
+
+class SparseFieldsetMixin:
+    """Returns only fields requested with `?fields=` in `list` and `retrieve`.
+
+    Use it together with `SparseFieldsetFilter`, which excludes columns
+    of fields that aren't returned from SQL query.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = get_requested_fields(self.request)
+        if fields is None:
+            return serializer
+
+        target = getattr(serializer, 'child', serializer)
+        if fields & target.fields.keys():
+            for name in target.fields.keys() - fields:
+                target.fields.pop(name)
+
+        return serializer
@@ -0,0 +1,27 @@
+import os
+
+from django.http import HttpResponse
+
+from prometheus_client import (
+    CollectorRegistry,
+    REGISTRY,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+    multiprocess,
+)
+
+
+def metrics_view(request) -> HttpResponse:
+    """Exposes prometheus metrics of application.
+
+    Under gunicorn every worker has own metrics, so if
+    `PROMETHEUS_MULTIPROC_DIR` is set metrics of all workers are
+    collected from that directory.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
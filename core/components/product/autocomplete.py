@@ -0,0 +1,95 @@
+import bisect
+import threading
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import QuerySet
+
+from components.general.caching.generations import get_generation_key, get_generation
+
+
+class TitlePrefixIndex:
+    """In-memory index of words of product titles.
+
+    It's used on databases without `pg_trgm`. Index is rebuilt when list
+    generation of `product` cache prefix changes, so it's outdated
+    together with cached lists.
+    """
+
+    def __init__(self) -> None:
+        self.generation = None
+        # Sorted `(word, id)` pairs and titles by ids.
+        self._words: list[tuple[str, int]] = []
+        self._titles: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, queryset: QuerySet) -> None:
+        titles = dict(queryset.values_list('id', 'title'))
+        self._words = sorted({
+            (word, pk) for pk, title in titles.items() for word in title.lower().split()
+        })
+        self._titles = titles
+
+    def _find(self, prefix: str) -> set[int]:
+        start = bisect.bisect_left(self._words, (prefix,))
+        ids = set()
+        for word, pk in self._words[start:]:
+            if not word.startswith(prefix):
+                break
+            ids.add(pk)
+
+        return ids
+
+    def search(self, queryset: QuerySet, query: str, limit: int) -> list[dict]:
+        """Finds products which titles have words that start with every
+        word of query.
+
+        Args:
+            queryset: Queryset of products that index is built from.
+            query: String object typed by user.
+            limit: Integer, maximal number of products.
+        Returns:
+            List of dictionaries with `id` and `title`, titles that start
+            with query go first, then shorter ones.
+        """
+        generation = get_generation(get_generation_key('product'))
+        with self._lock:
+            if generation != self.generation:
+                self._build(queryset)
+                self.generation = generation
+
+            words = query.lower().split()
+            ids = set.intersection(*(self._find(word) for word in words)) if words else set()
+            titles = {pk: self._titles[pk] for pk in ids}
+
+        query = query.lower().strip()
+        found = sorted(titles, key=lambda pk: (not titles[pk].lower().startswith(query), len(titles[pk]), pk))
+        return [{'id': pk, 'title': titles[pk]} for pk in found[:limit]]
+
+
+title_prefix_index = TitlePrefixIndex()
+
+
+def autocomplete_products(queryset: QuerySet, query: str, limit: int) -> list[dict]:
+    """Finds products which titles match partially typed query.
+
+    On Postgres titles are matched by trigram word similarity with GIN
+    index, so typos are tolerated. On other databases `TitlePrefixIndex`
+    is used.
+
+    Args:
+        queryset: Queryset of products to search in.
+        query: String object typed by user.
+        limit: Integer, maximal number of products.
+    Returns:
+        List of dictionaries with `id` and `title`, most similar first.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return title_prefix_index.search(queryset, query, limit)
+
+    return list(
+        queryset.filter(title__trigram_word_similar=query)
+        .annotate(similarity=TrigramWordSimilarity(query, 'title'))
+        .order_by('-similarity', 'id')
+        .values('id', 'title')[:limit]
+    )
@@ -0,0 +1,59 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from product.models import Product, ProductType
+
+
+def get_counted_product_type(product: Product) -> int | None:
+    """Gets id of type which `num_products` counts product.
+
+    Returns:
+        Integer or `None` if product isn't counted, only published
+        products are counted.
+    """
+    return product.product_type_id if product.is_published else None
+
+
+def move_counted_product(old_type_id: int | None, new_type_id: int | None) -> None:
+    """Moves product between `num_products` counters of types.
+
+    Counters are changed with `F()` expressions, so concurrent saves
+    of products don't overwrite each other's changes. Drifted counter
+    isn't decreased below `0`, it's fixed by `reconcile_num_products`.
+
+    Args:
+        old_type_id: Integer, id of type that counted product before,
+            `None` if it wasn't counted.
+        new_type_id: Integer, id of type that counts product now,
+            `None` if it isn't counted anymore.
+    """
+    if old_type_id == new_type_id:
+        return None
+
+    if old_type_id is not None:
+        ProductType.objects.filter(pk=old_type_id).update(num_products=Greatest(F('num_products') - 1, Value(0)))
+    if new_type_id is not None:
+        ProductType.objects.filter(pk=new_type_id).update(num_products=F('num_products') + 1)
+
+
+def reconcile_num_products() -> int:
+    """Recounts `num_products` of types which counters are wrong.
+
+    Counters can drift after bulk changes that don't send signals,
+    like `QuerySet.update()`.
+
+    Returns:
+        Integer, number of fixed types.
+    """
+    actual = Subquery(
+        Product.objects.published().filter(product_type=OuterRef('pk'))
+        .values('product_type')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    actual = Coalesce(actual, Value(0))
+    return (
+        ProductType.objects.annotate(actual=actual)
+        .exclude(num_products=F('actual'))
+        .update(num_products=actual)
+    )
@@ -0,0 +1,132 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, FloatField, OuterRef, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf, Round
+
+from components.general.caching.invalidation import invalidate_cache_of_objects, invalidate_cache_of_model
+from product.models import Product
+from product_review.models import ProductReview
+
+RATINGS = range(1, 6)
+
+
+def get_rating_count_field(rating: int) -> str:
+    """Gets name of histogram field of `Product` that counts rating,
+    for example: `rating_5_count`.
+    """
+    return f'rating_{rating}_count'
+
+
+def get_average_rating(rating_sum, rating_count):
+    """Gets expression of average rating rounded to one decimal place,
+    `0` for product without reviews.
+    """
+    return Coalesce(Round(Cast(rating_sum, FloatField()) / NullIf(rating_count, 0), 1), Value(0.0))
+
+
+def _round_average_rating(rating_sum: int, rating_count: int) -> float:
+    # Rounds half up like `ROUND` of database in `get_average_rating`.
+    average = Decimal(rating_sum) / Decimal(rating_count)
+    return float(average.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP))
+
+
+def _change_counter(field: str, delta: int):
+    """Gets expression of counter changed by delta. Counters can drift
+    after bulk changes that don't send signals, so decreased counter
+    is clamped at `0` instead of breaking constraint of positive field.
+    """
+    counter = F(field) + delta
+    return Greatest(counter, Value(0)) if delta < 0 else counter
+
+
+def change_product_rating(product_id: int, removed: int | None = None, added: int | None = None) -> None:
+    """Applies rating of created, updated or deleted review to product.
+
+    Counters, histogram and average rating are changed by one `UPDATE`
+    with `F()` expressions, so it takes the same time for any number of
+    reviews and concurrent reviews don't overwrite each other's changes.
+
+    Args:
+        product_id: Integer, id of reviewed product.
+        removed: Integer, rating that is removed from product, `None`
+            for new review.
+        added: Integer, rating that is added to product, `None` for
+            deleted review.
+    """
+    if removed == added:
+        return None
+
+    rating_sum = _change_counter('rating_sum', (added or 0) - (removed or 0))
+    rating_count = _change_counter('rating_count', int(added is not None) - int(removed is not None))
+    fields = {
+        'rating_sum': rating_sum,
+        'rating_count': rating_count,
+        'rating': get_average_rating(rating_sum, rating_count),
+    }
+    if removed is not None:
+        fields[get_rating_count_field(removed)] = _change_counter(get_rating_count_field(removed), -1)
+    if added is not None:
+        fields[get_rating_count_field(added)] = _change_counter(get_rating_count_field(added), 1)
+
+    Product.objects.filter(pk=product_id).update(**fields)
+    # Update doesn't send signals of `Product`.
+    invalidate_cache_of_objects(Product, [product_id])
+
+
+def recompute_product_ratings(chunk_size: int = 2000) -> tuple[int, int]:
+    """Recomputes rating counters of all products from their reviews.
+
+    Reviews are aggregated by one grouped query which rows are streamed
+    by chunks, every chunk is saved by one `bulk_update`. Products that
+    have counters but no reviews are reset by one `UPDATE`.
+
+    Reviews written while command runs can be overwritten by counters
+    computed before them, so it's meant to be run on quiet catalog.
+
+    Args:
+        chunk_size: Integer, number of products updated by one query.
+    Returns:
+        Tuple of integers, numbers of recomputed and reset products.
+    """
+    fields = ['rating', 'rating_sum', 'rating_count', *(get_rating_count_field(rating) for rating in RATINGS)]
+    ratings = (
+        ProductReview.objects.values('product')
+        .annotate(
+            rating_sum=Sum('rating'),
+            rating_count=Count('pk'),
+            **{get_rating_count_field(rating): Count('pk', filter=Q(rating=rating)) for rating in RATINGS},
+        )
+        .order_by()
+    )
+
+    recomputed = 0
+    products = []
+    for row in ratings.iterator(chunk_size=chunk_size):
+        products.append(Product(
+            pk=row.pop('product'),
+            rating=_round_average_rating(row['rating_sum'], row['rating_count']),
+            **row,
+        ))
+        if len(products) >= chunk_size:
+            recomputed += _save_ratings(products, fields)
+            products = []
+    recomputed += _save_ratings(products, fields)
+
+    reset = (
+        Product.objects.exclude(**dict.fromkeys(fields, 0))
+        .exclude(Exists(ProductReview.objects.filter(product=OuterRef('pk'))))
+        .update(**dict.fromkeys(fields, 0))
+    )
+
+    # Updates don't send signals of `Product`.
+    invalidate_cache_of_model(Product)
+    return recomputed, reset
+
+
+def _save_ratings(products: list[Product], fields: list[str]) -> int:
+    if not products:
+        return 0
+
+    with transaction.atomic():
+        return Product.objects.bulk_update(products, fields)
@@ -17,6 +17,24 @@ workers = multiprocessing.cpu_count() * 2 + 1
 timeout = 30
 graceful_timeout = 30
 
+# Prometheus metrics of all workers are stored in this directory
+prometheus_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    # Clear metrics left from previous run
+    if prometheus_multiproc_dir:
+        os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+        for file_name in os.listdir(prometheus_multiproc_dir):
+            os.remove(os.path.join(prometheus_multiproc_dir, file_name))
+
+
+def child_exit(server, worker):
+    if prometheus_multiproc_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
 # Logging
 logs_path = os.path.join(project_path, "logs")
 os.makedirs(logs_path, exist_ok=True)  # Ensure the "logs" directory exists
@@ -7,7 +7,7 @@ from celery import Celery
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 celery = Celery(
     "core",
-    include=['user.tasks'],
+    include=['user.tasks', 'product.tasks', 'components.general.caching.tasks'],
 )
 celery.config_from_object("django.conf:settings", namespace="CELERY")
 celery.autodiscover_tasks()
@@ -57,6 +57,13 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_PASSWORD')
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULTS')
 CELERY_DISABLE_RATE_LIMITS = True
+# Periodic tasks, beat runs embedded in worker (see `start-celeryworker`).
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-product-type-counts': {
+        'task': 'product.tasks.reconcile_product_type_counts',
+        'schedule': 60 * 60,
+    },
+}
 
 LOGGING = initialize_loggers()
 
@@ -67,6 +74,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Custom Apps
     'user.apps.UserConfig',
@@ -149,11 +157,18 @@ CACHES = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": LOCATION,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient"
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "COMPRESSOR": "components.general.caching.compressors.ThresholdCompressor",
+            "COMPRESS_MIN_LENGTH": int(os.environ.get("CACHE_COMPRESS_MIN_LENGTH", 1024)),
         },
     }
 }
 
+# Public base URL of API, cache is warmed up with the same hyperlinks as clients get.
+# Its host must be in ALLOWED_HOSTS, warm up is disabled if it isn't set.
+CACHE_WARM_UP_URL = os.environ.get("CACHE_WARM_UP_URL")
+CACHE_WARM_UP_AFTER_INVALIDATION = bool(int(os.environ.get("CACHE_WARM_UP_AFTER_INVALIDATION", default=0)))
+
 
 LANGUAGE_CODE = 'uk'
 LOCALE_PATHS = [BASE_DIR / 'locale/']
@@ -178,15 +193,23 @@ STATICFILES_DIRS = [
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'components.general.pagination.ApproximateCountPagination',
     'PAGE_SIZE': 12,
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication'
     ),
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend',
+        'components.general.sparse_fields.SparseFieldsetFilter',
+    ],
 }
 
+# Postgres text search configuration of product search. `ukrainian` needs
+# dictionary installed on database server. Search vectors are built by
+# trigger from product migration 0010, it has to be recreated after change.
+PRODUCT_SEARCH_CONFIG = os.environ.get("PRODUCT_SEARCH_CONFIG", "simple")
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=60),
@@ -2,11 +2,14 @@ from django.conf.urls.static import static
 from django.urls import path, include
 from django.contrib import admin
 
+from components.general.views import metrics_view
+
 from . import settings
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('', include('core.router'))
 ]
 
@@ -7,3 +7,5 @@ class ImageConfig(AppConfig):
 
     def ready(self) -> None:
         import image.signals # NOQA
+        # Viewsets register models that their cache depends on
+        import image.views # NOQA
@@ -7,3 +7,5 @@ class ProductConfig(AppConfig):
 
     def ready(self) -> None:
         import product.signals # NOQA
+        # Viewsets register models that their cache depends on
+        import product.views # NOQA
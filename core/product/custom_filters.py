@@ -1,5 +1,10 @@
 import django_filters
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
 
+from rest_framework import filters
 from rest_framework.exceptions import APIException
 
 from .models import Product
@@ -20,6 +25,18 @@ class ProductFilter(django_filters.FilterSet):
 
         return queryset.filter(product_type__id__in=values)
 
+    @staticmethod
+    def normalize_product_type(value: str) -> str:
+        """Normalizes list of id's, so `2,1,2` and `1,2` give the same value.
+
+        Invalid value returns as is, it will be rejected by `filter_product_type`.
+        """
+        values = value.split(',')
+        if not all(v.isdigit() for v in values):
+            return value
+
+        return ','.join(str(v) for v in sorted({int(v) for v in values}))
+
     class Meta:
         model = Product
         fields = {
@@ -27,3 +44,26 @@ class ProductFilter(django_filters.FilterSet):
             "rating": ["gte", "lte"],
             "quantity_in_stock": ["gte", "lte"]
         }
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """Full-text search of products.
+
+    On Postgres products are searched by `search_vector` with GIN index,
+    matches in title weigh more than in components and description.
+    Results are ordered by rank unless `ordering` is requested, so filter
+    should go after `OrderingFilter`. On other databases it works as
+    `SearchFilter` with `ILIKE` on `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(' '.join(search_terms), config=settings.PRODUCT_SEARCH_CONFIG, search_type='websearch')
+        queryset = queryset.filter(search_vector=query)
+        if filters.OrderingFilter.ordering_param in request.query_params:
+            return queryset
+
+        return queryset.annotate(search_rank=SearchRank(F('search_vector'), query)).order_by('-search_rank', '-id')
@@ -0,0 +1,130 @@
+import random
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from product.models import Product, ProductType, PriceCurrency
+
+
+class Command(BaseCommand):
+    help = ('Seeds catalog of products and prints query plans of catalog queries '
+            'without and with indexes of `Product`. All changes are rolled back, '
+            'but indexes are dropped and the product table is locked until the end, '
+            'so it runs only with DEBUG or --force. Do not run it against live database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100000,
+                            help='Number of seeded products.')
+        parser.add_argument('--types', type=int, default=20,
+                            help='Number of seeded product types.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of products created by one query.')
+        parser.add_argument('--force', action='store_true',
+                            help='Run without DEBUG, blocks reads and writes of products until the end.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Benchmark drops indexes of products and locks their table until it ends. '
+                               'Run it with DEBUG on a copy of database, or pass --force.')
+
+        with transaction.atomic():
+            product_types = self._seed(options['products'], options['types'], options['batch_size'])
+            queries = self._get_queries(product_types)
+
+            self._set_indexes(create=False)
+            self._print_plans('Without indexes', queries)
+            self._set_indexes(create=True)
+            self._print_plans('With indexes', queries)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Seeded products are rolled back.'))
+
+    def _seed(self, number: int, types: int, batch_size: int) -> list[ProductType]:
+        """Creates product types and products, about 80% of products
+        are published.
+
+        Returns:
+            List of created `ProductType` instances.
+        """
+        started_at = time.monotonic()
+        # Catalog usually has hryvnia already, currencies are unique.
+        currency, _ = PriceCurrency.objects.get_or_create(currency='UAH',
+                                                          defaults={'currency_symbol': '₴', 'country': 'Ukraine'})
+        product_types = ProductType.objects.bulk_create(
+            ProductType(title=f'Benchmark type {i}') for i in range(types)
+        )
+
+        for start in range(0, number, batch_size):
+            Product.objects.bulk_create(
+                Product(
+                    title=f'Benchmark product {i}',
+                    price=Decimal(random.randint(100, 100000)) / 100,
+                    price_currency=currency,
+                    product_type=random.choice(product_types),
+                    quantity_in_stock=random.randint(0, 500),
+                    product_quantity='100 g',
+                    discount=random.choice([0, 0, 0, 5, 10, 25]),
+                    rating=round(random.uniform(0, 5), 1),
+                    manufacturer='Benchmark',
+                    is_published=random.random() < 0.8,
+                )
+                for i in range(start, min(start + batch_size, number))
+            )
+
+        self._analyze()
+        self.stdout.write(f'Seeded {number} products in {time.monotonic() - started_at:.1f}s.')
+        return product_types
+
+    def _get_queries(self, product_types: list[ProductType]) -> dict:
+        """Gets querysets of published catalog with filters and ordering
+        that `ProductViewset` gets from clients.
+        """
+        published = Product.objects.published()
+        type_ids = [product_type.id for product_type in product_types[:2]]
+
+        return {
+            'Newest':
+                published.order_by('-id'),
+            'Types and price range, ordered by price':
+                published.filter(product_type__id__in=type_ids, price__gte=100, price__lte=500).order_by('price'),
+            'Type, ordered by rating':
+                published.filter(product_type__id__in=type_ids[:1]).order_by('-rating'),
+            'Rating range, ordered by rating':
+                published.filter(rating__gte=4.5).order_by('-rating'),
+            'Ordered by price':
+                published.order_by('price'),
+            'Ordered by discount':
+                published.order_by('-discount'),
+            'Ordered by title':
+                published.order_by('title'),
+        }
+
+    def _set_indexes(self, create: bool) -> None:
+        """Creates or drops indexes declared in `Product.Meta.indexes`."""
+        schema_editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for index in Product._meta.indexes:
+                if create:
+                    cursor.execute(str(index.create_sql(Product, schema_editor)))
+                else:
+                    cursor.execute(str(index.remove_sql(Product, schema_editor)))
+
+        self._analyze()
+
+    def _analyze(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Product._meta.db_table}')
+
+    def _print_plans(self, title: str, queries: dict) -> None:
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        # Only Postgres runs query to show actual time.
+        options = {'analyze': True} if connection.vendor == 'postgresql' else {}
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{title}'))
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_LABEL(f'\n{name}:'))
+            self.stdout.write(queryset[:page_size].explain(**options))
@@ -0,0 +1,33 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from components.general.caching.tasks import warm_cache
+from components.general.caching.warm_up import get_warm_up_url, warm_up_cache
+from components.general.constants import CACHE_WARM_UP_PAGES
+
+
+class Command(BaseCommand):
+    help = 'Populates cache of first pages of cached viewsets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('prefixes', nargs='*',
+                            help='Cache prefixes to warm up, for example: product. All by default.')
+        parser.add_argument('--pages', type=int, default=CACHE_WARM_UP_PAGES,
+                            help='Number of pages of every list.')
+        parser.add_argument('--async', action='store_true', dest='is_async',
+                            help='Send warm up to Celery worker instead of running it here.')
+
+    def handle(self, *args, **options):
+        prefixes = options['prefixes'] or None
+        try:
+            get_warm_up_url()
+        except ImproperlyConfigured as e:
+            raise CommandError(e)
+
+        if options['is_async']:
+            warm_cache.delay(prefixes, options['pages'])
+            self.stdout.write('Cache warm up is scheduled.')
+            return
+
+        warmed = warm_up_cache(prefixes, options['pages'])
+        self.stdout.write(self.style.SUCCESS(f'Cache warmed up, {warmed} pages requested.'))
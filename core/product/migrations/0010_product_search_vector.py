@@ -0,0 +1,66 @@
+import re
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+def create_search_vector_trigger(apps, schema_editor):
+    """Creates trigger that maintains search vector of products,
+    GIN index on it and fills vectors of existing products.
+
+    Only Postgres has full-text search, on other databases the
+    column stays empty and search falls back to `ILIKE`.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    config = settings.PRODUCT_SEARCH_CONFIG
+    if not re.fullmatch(r'[\w.]+', config):
+        raise ValueError(f"Invalid text search configuration: {config}")
+
+    schema_editor.execute(f"""
+        CREATE OR REPLACE FUNCTION product_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('{config}', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('{config}', coalesce(NEW.components, '')), 'B') ||
+                setweight(to_tsvector('{config}', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    schema_editor.execute("""
+        CREATE TRIGGER product_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, components, description ON product_product
+        FOR EACH ROW EXECUTE FUNCTION product_search_vector_update()
+    """)
+    schema_editor.execute("UPDATE product_product SET title = title")
+    schema_editor.execute(
+        "CREATE INDEX product_search_vector_gin ON product_product USING gin (search_vector)"
+    )
+
+
+def drop_search_vector_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS product_search_vector_gin")
+    schema_editor.execute("DROP TRIGGER IF EXISTS product_search_vector_trigger ON product_product")
+    schema_editor.execute("DROP FUNCTION IF EXISTS product_search_vector_update()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0009_alter_product_price"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_trigger, drop_search_vector_trigger),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_title_trigram_index(apps, schema_editor):
+    """Creates `pg_trgm` GIN index on product titles for autocomplete.
+
+    On other databases autocomplete uses in-memory index instead.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX product_title_trgm_gin ON product_product USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_title_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS product_title_trgm_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0010_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_trigram_index, drop_title_trigram_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0012_product_catalog_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["-id"],
+                name="product_pub_id_idx",
+            ),
+        ),
+    ]
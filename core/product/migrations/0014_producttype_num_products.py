@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_products(apps, schema_editor):
+    ProductType = apps.get_model("product", "ProductType")
+    counts = (
+        ProductType.objects.filter(products__is_published=True)
+        .annotate(count=Count("products"))
+        .values_list("pk", "count")
+    )
+    for pk, count in counts:
+        ProductType.objects.filter(pk=pk).update(num_products=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0013_product_published_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="producttype",
+            name="num_products",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Кількість продуктів"
+            ),
+        ),
+        migrations.RunPython(count_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:29
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def fill_null_discount_and_rating(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    Product.objects.filter(discount__isnull=True).update(discount=0)
+    Product.objects.filter(rating__isnull=True).update(rating=0.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0015_product_rating_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_null_discount_and_rating, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="product",
+            name="discount",
+            field=models.PositiveSmallIntegerField(
+                blank=True, default=0, verbose_name="Знижка"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="rating",
+            field=models.FloatField(
+                blank=True,
+                default=0.0,
+                validators=[
+                    django.core.validators.MinValueValidator(0.0),
+                    django.core.validators.MaxValueValidator(5.0),
+                ],
+                verbose_name="Рейтинг",
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
@@ -8,6 +9,8 @@ class ProductType(models.Model):
                              max_length=255,
                              blank=False,
                              null=False)
+    # Number of published products, maintained by signals of `Product`.
+    num_products = models.PositiveIntegerField('Кількість продуктів', default=0, editable=False)
 
     def __str__(self):
         return f'ID: {self.id} | Type: {self.title}'
@@ -29,6 +32,13 @@ class PriceCurrency(models.Model):
         ordering = ['-id']
 
 
+class ProductQuerySet(models.QuerySet):
+
+    def published(self):
+        """Filters products that are shown in public catalog."""
+        return self.filter(is_published=True)
+
+
 class Product(models.Model):
     title = models.CharField('Назва', max_length=70, blank=False, null=False)
     price = models.DecimalField('Ціна',
@@ -51,20 +61,33 @@ class Product(models.Model):
     description = models.TextField('Опис', max_length=500, default='', blank=True, null=False)  # NOQA
     quantity_in_stock = models.PositiveIntegerField('Кількість на складі', blank=False, null=False)  # NOQA
     product_quantity = models.CharField('Обсяг продукту', max_length=255, blank=False, null=False)  # NOQA
-    discount = models.PositiveSmallIntegerField('Знижка', default=0, blank=True, null=True)  # NOQA
+    discount = models.PositiveSmallIntegerField('Знижка', default=0, blank=True, null=False)  # NOQA
     rating = models.FloatField(
         'Рейтинг',
         default=0.0,
         blank=True,
-        null=True,
+        null=False,
         validators=[
             MinValueValidator(0.0),
             MaxValueValidator(5.0)
         ]
     )
+    # Counters of reviews, maintained by signals of `ProductReview`,
+    # `rating` is their average.
+    rating_sum = models.PositiveIntegerField('Сума оцінок', default=0, editable=False)
+    rating_count = models.PositiveIntegerField('Кількість оцінок', default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField('Кількість оцінок 1', default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField('Кількість оцінок 2', default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField('Кількість оцінок 3', default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField('Кількість оцінок 4', default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField('Кількість оцінок 5', default=0, editable=False)
     components = models.TextField('Склад', max_length=500, default='', blank=True, null=True)
     manufacturer = models.CharField('Виробник', max_length=100, blank=False, null=False)
     is_published = models.BooleanField('Опубліковано', default=False, null=False, blank=False)
+    # Maintained by database trigger on Postgres, see migration 0010.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ProductQuerySet.as_manager()
 
     def __str__(self):
         _title = self.title
@@ -84,3 +107,28 @@ class Product(models.Model):
 
     class Meta:
         ordering = ['-id']
+        # Published catalog is filtered by `ProductFilter` and sorted by
+        # `ordering_fields` of `ProductViewset`, drafts aren't indexed.
+        indexes = [
+            models.Index(fields=['-id'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_id_idx'),
+            models.Index(fields=['product_type', 'price'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_type_price_idx'),
+            models.Index(fields=['product_type', '-rating'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_type_rating_idx'),
+            models.Index(fields=['price'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_price_idx'),
+            models.Index(fields=['-rating'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_rating_idx'),
+            models.Index(fields=['-discount'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_discount_idx'),
+            models.Index(fields=['title'],
+                         condition=models.Q(is_published=True),
+                         name='product_pub_title_idx'),
+        ]
@@ -44,7 +44,7 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ['search_vector', 'rating_sum']
 
     def to_representation(self, instance: Product) -> OrderedDict:
         """Sets final representation of fields.
@@ -60,10 +60,22 @@ class ProductSerializer(serializers.ModelSerializer):
             Ordered dictionary of representation.
         """
         representation = super().to_representation(instance)
-        __currency = instance.price_currency
-        __product_type = instance.product_type
-        representation['discount'] = f'{instance.discount}%'
-        representation['product_type'] = 'UNDEFINED' if __product_type is None else __product_type.title
-        representation['price_currency'] = 'UNDEFINED' if __currency is None else __currency.currency
-        representation['price_currency_symbol'] = 'UNDEFINED' if __currency is None else __currency.currency_symbol
+        # Fields can be excluded with `?fields=`, so only present ones are modified.
+        if 'discount' in representation:
+            representation['discount'] = f'{instance.discount}%'
+        if 'product_type' in representation:
+            __product_type = instance.product_type
+            representation['product_type'] = 'UNDEFINED' if __product_type is None else __product_type.title
+        if 'price_currency' in representation:
+            __currency = instance.price_currency
+            representation['price_currency'] = 'UNDEFINED' if __currency is None else __currency.currency
+            representation['price_currency_symbol'] = 'UNDEFINED' if __currency is None else __currency.currency_symbol
         return representation
+
+
+class ProductAutocompleteSerializer(serializers.ModelSerializer):
+    """Provides suggestion of product for autocomplete."""
+
+    class Meta:
+        model = Product
+        fields = ['id', 'title']
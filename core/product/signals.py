@@ -1,7 +1,38 @@
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .models import Product
+from components.product.counters import get_counted_product_type, move_counted_product
+
+
+# Counters are connected before `ensure_published_product_has_main_image`,
+# which saves product again inside `post_save`, so outer save is counted
+# before nested one.
+@receiver(pre_save, sender=Product)
+def remember_counted_product_type(sender, instance, update_fields=None, **kwargs):
+    """Remembers type which counted product before saving."""
+    instance._counted_product_type = None
+    if instance._state.adding or instance.pk is None:
+        return None
+
+    if update_fields is not None and not {'product_type', 'is_published'} & set(update_fields):
+        instance._counted_product_type = get_counted_product_type(instance)
+        return None
+
+    saved = Product.objects.filter(pk=instance.pk).values('product_type_id', 'is_published').first()
+    if saved is not None and saved['is_published']:
+        instance._counted_product_type = saved['product_type_id']
+
+
+@receiver(post_save, sender=Product)
+def update_num_products(sender, instance, **kwargs):
+    old_type_id = getattr(instance, '_counted_product_type', None)
+    move_counted_product(old_type_id, get_counted_product_type(instance))
+
+
+@receiver(post_delete, sender=Product)
+def decrease_num_products(sender, instance, **kwargs):
+    move_counted_product(get_counted_product_type(instance), None)
 
 
 @receiver(post_save, sender=Product)
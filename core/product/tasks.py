@@ -0,0 +1,24 @@
+import logging
+
+from celery import shared_task
+
+from components.general.caching.delete_cache_keys import delete_all_keys_with_prefix
+from components.product.counters import reconcile_num_products
+
+logger = logging.getLogger('django')
+
+
+@shared_task
+def reconcile_product_type_counts() -> int:
+    """Fixes `num_products` counters of product types that drifted.
+
+    Returns:
+        Integer, number of fixed types.
+    """
+    fixed = reconcile_num_products()
+    if fixed:
+        # Counters are updated without signals.
+        delete_all_keys_with_prefix('product_type')
+        logger.warning(f"Fixed number of products of {fixed} product types")
+
+    return fixed
@@ -0,0 +1,185 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from cart.models import Cart, CartItem
+from components.general.caching.generations import get_generation, get_generation_key, get_user_generation_key
+from image.models import Image
+from product.models import Product, ProductType, PriceCurrency
+from user.models import User
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_published_product(title: str, **kwargs) -> Product:
+    product_type, _ = ProductType.objects.get_or_create(title='Моті')
+    currency, _ = PriceCurrency.objects.get_or_create(currency='UAH', currency_symbol='₴', country='Ukraine')
+    kwargs.setdefault('product_type', product_type)
+    product = Product.objects.create(title=title, price=100, price_currency=currency, quantity_in_stock=5,
+                                     product_quantity='100 g', manufacturer='Sakura', **kwargs)
+    # Published product must have image, file itself isn't needed.
+    Image.objects.create(image=f'product_{product.pk}/main.png', related_to=product, main_image=True)
+    product.is_published = True
+    product.save()
+    return product
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProductAutocompleteTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.product = create_published_product('Mochi')
+
+    def test_fields_are_part_of_cache_key(self):
+        response = self.client.get('/products/autocomplete/?q=moc&fields=id')
+        self.assertEqual(response.json(), [{'id': self.product.pk}])
+
+        response = self.client.get('/products/autocomplete/?q=moc')
+        self.assertEqual(response.json(), [{'id': self.product.pk, 'title': 'Mochi'}])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProductCursorPaginationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.products = [
+            create_published_product(f'Mochi {i}', discount=discount)
+            for i, discount in enumerate([10, 5, 5, 0, 0, 25])
+        ]
+
+    def get_all_pages(self, url: str) -> list[int]:
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [product['id'] for product in response.json()['results']]
+            url = response.json()['next']
+
+        return ids
+
+    def test_cursor_crosses_equal_values(self):
+        for ordering in ('discount', '-discount'):
+            ids = self.get_all_pages(f'/products/?pagination=cursor&ordering={ordering}&page_size=2')
+            self.assertCountEqual(ids, [product.pk for product in self.products])
+
+
+class ProductTypeCounterTest(APITestCase):
+
+    def setUp(self):
+        self.product = create_published_product('Mochi')
+        self.product_type = self.product.product_type
+
+    def test_published_products_are_counted(self):
+        self.product_type.refresh_from_db()
+        self.assertEqual(self.product_type.num_products, 1)
+
+        self.product.is_published = False
+        self.product.save()
+        self.product_type.refresh_from_db()
+        self.assertEqual(self.product_type.num_products, 0)
+
+    def test_drifted_counter_is_not_decreased_below_zero(self):
+        ProductType.objects.filter(pk=self.product_type.pk).update(num_products=0)
+
+        self.product.product_type = ProductType.objects.create(title='Данго')
+        self.product.save()
+        self.product_type.refresh_from_db()
+        self.assertEqual(self.product_type.num_products, 0)
+        self.product.product_type.refresh_from_db()
+        self.assertEqual(self.product.product_type.num_products, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DeferredInvalidationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = create_published_product('Mochi')
+        self.generation_key = get_generation_key('product', str(self.product.pk))
+        self.generation = get_generation(self.generation_key)
+
+    def test_committed_change_invalidates_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.title = 'Dango'
+            self.product.save()
+
+        self.assertNotEqual(get_generation(self.generation_key), self.generation)
+
+    def test_rolled_back_change_doesnt_invalidate_cache(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            self.product.title = 'Dango'
+            self.product.save()
+            raise ValueError
+
+        # Next commit of the same thread doesn't flush rolled back keys.
+        with self.captureOnCommitCallbacks(execute=True):
+            PriceCurrency.objects.create(currency='USD', currency_symbol='$', country='USA')
+
+        self.assertEqual(get_generation(self.generation_key), self.generation)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheInvalidationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = create_published_product('Mochi')
+        self.url = f'/products/{self.product.pk}/'
+
+    def change(self, instance, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name, value in fields.items():
+                setattr(instance, name, value)
+            instance.save()
+
+    def test_product_change_invalidates_list_and_retrieve(self):
+        self.assertEqual(self.client.get('/products/').json()['results'][0]['title'], 'Mochi')
+        self.assertEqual(self.client.get(self.url).json()['title'], 'Mochi')
+
+        self.change(self.product, title='Dango')
+
+        self.assertEqual(self.client.get('/products/').json()['results'][0]['title'], 'Dango')
+        self.assertEqual(self.client.get(self.url).json()['title'], 'Dango')
+
+    def test_product_type_rename_invalidates_its_products(self):
+        self.assertEqual(self.client.get(self.url).json()['product_type'], 'Моті')
+
+        self.change(self.product.product_type, title='Данго')
+
+        self.assertEqual(self.client.get(self.url).json()['product_type'], 'Данго')
+
+    def test_cart_item_change_invalidates_only_owner_carts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            users = [User.objects.create_user(f'user{i}@example.com', 'password') for i in range(2)]
+            items = [CartItem.objects.create(cart=Cart.objects.create(cart_owner=user), product=self.product)
+                     for user in users]
+        for user in users:
+            self.client.force_authenticate(user)
+            self.assertEqual(self.client.get('/carts/').status_code, 200)
+        generations = [get_generation(get_user_generation_key('cart', user.pk)) for user in users]
+
+        self.change(items[0], quantity=2)
+
+        self.assertNotEqual(get_generation(get_user_generation_key('cart', users[0].pk)), generations[0])
+        self.assertEqual(get_generation(get_user_generation_key('cart', users[1].pk)), generations[1])
+        # Cart list of other user is still served from cache.
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/carts/').status_code, 200)
+
+    def test_matching_etag_is_answered_with_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.change(self.product, title='Dango')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Dango')
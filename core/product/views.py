@@ -1,13 +1,18 @@
-from django.db.models import Count
-
 from rest_framework import filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django_filters.rest_framework.backends import DjangoFilterBackend
 
 from components.product import permissions as custom_permissions
 from components.general.caching.viewsets import CacheModelViewSet
+from components.general.constants import AUTOCOMPLETE_DEFAULT_LIMIT, AUTOCOMPLETE_MAX_LIMIT
+from components.general.pagination import OptionalCursorPagination
+from components.general.sparse_fields import FIELDS_QUERY_PARAM, SparseFieldsetFilter, normalize_fields
+from components.product.autocomplete import autocomplete_products
 
 from product.models import Product, ProductType, PriceCurrency
-from product.custom_filters import ProductFilter
+from image.models import Image
+from product.custom_filters import ProductFilter, ProductSearchFilter
 from product import serializers
 
 
@@ -15,29 +20,41 @@ class PriceCurrencyViewset(CacheModelViewSet):
     queryset = PriceCurrency.objects.all()
     cache_key = "price_currency"
     timeout = 60 * 60 * 12
+    local_timeout = 60 * 5
     serializer_class = serializers.PriceCurrencySerializer
     permission_classes = [custom_permissions.IsAdminOrStaff,]
 
 
 class ProductTypeViewset(CacheModelViewSet):
-    queryset = ProductType.objects.annotate(num_products=Count('products')).order_by('-num_products')  # NOQA
+    queryset = ProductType.objects.order_by('-num_products')
     cache_key = "product_type"
     timeout = 60 * 60 * 12
+    local_timeout = 60 * 5
+    cache_dependencies = {Product: 'products'}
     serializer_class = serializers.ProductTypeSerializer
     permission_classes = [custom_permissions.IsAdminOrStaff,]
 
 
 class ProductViewset(CacheModelViewSet):
-    queryset = Product.objects.select_related('product_type', 'price_currency').prefetch_related('image_set').all()
+    queryset = Product.objects.select_related('product_type', 'price_currency').prefetch_related('image_set').defer('search_vector')  # NOQA
     cache_key = "product"
-    timeout = 25
+    timeout = 60 * 60
+    stale_timeout = 60 * 5
+    cache_rendered = True
+    cache_dependencies = {
+        Image: 'image',
+        ProductType: 'product_type',
+        PriceCurrency: 'price_currency',
+    }
     serializer_class = serializers.ProductSerializer
     permission_classes = [custom_permissions.IsAdminOrStaff,]
+    pagination_class = OptionalCursorPagination
     # Filters
     filter_backends = [
-        filters.SearchFilter,
         filters.OrderingFilter,
+        ProductSearchFilter,  # Orders by rank, so it goes after ordering
         DjangoFilterBackend,
+        SparseFieldsetFilter,
     ]
     filterset_class = ProductFilter  # Custom filter
     filterset_fields = [
@@ -50,3 +67,43 @@ class ProductViewset(CacheModelViewSet):
         "id", "price", "quantity_in_stock", "rating", "discount", "title"
     ]
     ordering = ["-id"]
+    cache_query_normalizers = {
+        "product_type": ProductFilter.normalize_product_type,
+        "fields": normalize_fields,
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Drafts are shown to staff only, cache keeps their responses
+        # apart from public ones.
+        if not self.request.user.is_staff:
+            queryset = queryset.published()
+
+        return queryset
+
+    @action(detail=False, methods=['get'], filter_backends=[], pagination_class=None,
+            serializer_class=serializers.ProductAutocompleteSerializer,
+            cache_query_params=['q', 'limit', FIELDS_QUERY_PARAM])
+    def autocomplete(self, request, *args, **kwargs):
+        """Suggests published products which titles match `?q=`.
+
+        Returns up to `?limit=` suggestions with `id` and `title`.
+        """
+        cache_key = getattr(self, 'cache_key', self.default_cache_key) + '_autocomplete'
+        timeout = getattr(self, 'timeout', self.default_timeout)
+
+        return self.cached_method_wrapper(self._autocomplete, cache_key=cache_key, timeout=timeout)(request, *args, **kwargs)
+
+    def _autocomplete(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(int(request.query_params['limit']), AUTOCOMPLETE_MAX_LIMIT)
+        except (KeyError, ValueError):
+            limit = AUTOCOMPLETE_DEFAULT_LIMIT
+
+        products = []
+        if query and limit > 0:
+            queryset = Product.objects.published()
+            products = autocomplete_products(queryset, query, limit)
+
+        return Response(self.get_serializer(products, many=True).data)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProductReviewConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "product_review"
+
+    def ready(self) -> None:
+        import product_review.signals # NOQA
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from components.review.ratings import recompute_product_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recomputes rating, rating counters and histogram of all products from reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Number of products updated by one query.')
+
+    def handle(self, *args, **options):
+        recomputed, reset = recompute_product_ratings(options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Ratings recomputed for {recomputed} products, reset for {reset} products without reviews.'
+        ))
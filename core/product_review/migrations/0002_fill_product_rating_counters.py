@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+def fill_rating_counters(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    ProductReview = apps.get_model("product_review", "ProductReview")
+    ratings = (
+        ProductReview.objects.values("product")
+        .annotate(
+            rating_sum=Sum("rating"),
+            rating_count=Count("pk"),
+            **{
+                f"rating_{rating}_count": Count("pk", filter=Q(rating=rating))
+                for rating in range(1, 6)
+            },
+        )
+        .order_by()
+    )
+    for row in ratings.iterator():
+        Product.objects.filter(pk=row.pop("product")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0015_product_rating_counters"),
+        ("product_review", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_rating_counters, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,6 @@
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.core.exceptions import ValidationError
-from django.db.models import Avg
 
 from product.models import Product
 from user.models import User
@@ -37,22 +36,6 @@ class ProductReview(models.Model):
     )
     text = models.TextField(verbose_name='Відгук', null=True, blank=True, max_length=500)
 
-    def save(self, *args, **kwargs):
-        super(ProductReview, self).save(*args, **kwargs)
-        self.update_product_rating()
-
-    def update_product_rating(self):
-        product = self.product
-        ratings = ProductReview.objects.filter(product=product)
-        avg_product_rating = ratings.aggregate(Avg("rating"))['rating__avg']
-
-        if avg_product_rating is not None:
-            product.rating = round(avg_product_rating, 1)  # Round to handle decimal averages
-        else:
-            product.rating = 0
-
-        product.save()
-
     def __str__(self):
         return f"{self.user.email} - {self.product.title}: {self.rating}"
 
@@ -0,0 +1,33 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from components.review.ratings import change_product_rating
+from .models import ProductReview
+
+
+@receiver(pre_save, sender=ProductReview)
+def remember_review_rating(sender, instance, **kwargs):
+    """Remembers product and rating of review before saving."""
+    instance._saved_rating = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._saved_rating = ProductReview.objects.filter(pk=instance.pk).values_list('product_id', 'rating').first()
+
+
+@receiver(post_save, sender=ProductReview)
+def update_product_rating(sender, instance, **kwargs):
+    saved_rating = getattr(instance, '_saved_rating', None)
+    if saved_rating is None:
+        change_product_rating(instance.product_id, added=instance.rating)
+        return None
+
+    product_id, rating = saved_rating
+    if product_id == instance.product_id:
+        change_product_rating(product_id, removed=rating, added=instance.rating)
+    else:
+        change_product_rating(product_id, removed=rating)
+        change_product_rating(instance.product_id, added=instance.rating)
+
+
+@receiver(post_delete, sender=ProductReview)
+def remove_product_rating(sender, instance, **kwargs):
+    change_product_rating(instance.product_id, removed=instance.rating)
@@ -0,0 +1,68 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from product.models import Product
+from product.tests import LOCMEM_CACHES, create_published_product
+from product_review.models import ProductReview
+from user.models import User
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProductRatingTest(APITestCase):
+
+    def setUp(self):
+        self.product = create_published_product('Mochi')
+        self.other_product = create_published_product('Dango')
+        self.users = [User.objects.create_user(f'user{i}@example.com', 'password') for i in range(2)]
+
+    def assertRating(self, product: Product, rating: float, histogram: dict[int, int]):
+        product.refresh_from_db()
+        self.assertEqual(product.rating, rating)
+        self.assertEqual(product.rating_sum, sum(value * count for value, count in histogram.items()))
+        self.assertEqual(product.rating_count, sum(histogram.values()))
+        for value in range(1, 6):
+            self.assertEqual(getattr(product, f'rating_{value}_count'), histogram.get(value, 0))
+
+    def test_created_reviews(self):
+        ProductReview.objects.create(product=self.product, user=self.users[0], rating=5)
+        ProductReview.objects.create(product=self.product, user=self.users[1], rating=2)
+
+        self.assertRating(self.product, 3.5, {5: 1, 2: 1})
+        self.assertRating(self.other_product, 0.0, {})
+
+    def test_updated_review(self):
+        review = ProductReview.objects.create(product=self.product, user=self.users[0], rating=5)
+        ProductReview.objects.create(product=self.product, user=self.users[1], rating=4)
+
+        review.rating = 1
+        review.save()
+
+        self.assertRating(self.product, 2.5, {1: 1, 4: 1})
+
+    def test_review_moved_to_other_product(self):
+        review = ProductReview.objects.create(product=self.product, user=self.users[0], rating=5)
+        ProductReview.objects.create(product=self.product, user=self.users[1], rating=4)
+
+        review.product = self.other_product
+        review.rating = 3
+        review.save()
+
+        self.assertRating(self.product, 4.0, {4: 1})
+        self.assertRating(self.other_product, 3.0, {3: 1})
+
+    def test_deleted_review(self):
+        review = ProductReview.objects.create(product=self.product, user=self.users[0], rating=5)
+        ProductReview.objects.create(product=self.product, user=self.users[1], rating=4)
+
+        review.delete()
+        self.assertRating(self.product, 4.0, {4: 1})
+
+        ProductReview.objects.get().delete()
+        self.assertRating(self.product, 0.0, {})
+
+    def test_drifted_counters_are_not_decreased_below_zero(self):
+        review = ProductReview.objects.create(product=self.product, user=self.users[0], rating=5)
+        Product.objects.filter(pk=self.product.pk).update(rating_sum=0, rating_count=0, rating_5_count=0)
+
+        review.delete()
+        self.assertRating(self.product, 0.0, {})
@@ -1,6 +1,8 @@
 from rest_framework import viewsets
 from .serializers import ReviewListSerializer
 from components.review import permissions as custom_permissions
+from components.general.pagination import OptionalCursorPagination
+from components.general.sparse_fields import SparseFieldsetMixin
 
 from .models import ProductReview
 
@@ -16,8 +18,9 @@ For future development # NOQA
 #     product.save()  # Save the updated product rating
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = ProductReview.objects.select_related('product').prefetch_related('user')
     serializer_class = ReviewListSerializer
     permission_classes = [custom_permissions.IsReviewOwnerOrStaff]
+    pagination_class = OptionalCursorPagination
 
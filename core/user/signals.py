@@ -1,7 +1,7 @@
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save
 from django.dispatch import receiver
 
-from components.general.caching.delete_cache_keys import delete_keys_with_prefix
+from components.general.caching.invalidation import register_cache_dependencies
 from user.models import User
 
 
@@ -21,24 +21,6 @@ def set_user_new_password_after_update(sender, instance: User, **kwargs) -> None
             instance.set_password(instance.password)
 
 
-names_map = {
-    "producttype": "product_type",
-    "pricecurrency": "price_currency",
-    "cartitem": "cart_item"
-}
-
-
-def _get_cache_prefix(sender):
-    sender_name = sender._meta.model_name
-    prefix = names_map.get(sender_name, None) or sender_name
-    return prefix
-
-
-@receiver([post_save, post_delete])
-def clear_cache(sender, instance, **kwargs) -> None:
-    prefix = _get_cache_prefix(sender)
-    try:
-        pk = instance.id if instance.id else ''
-        delete_keys_with_prefix(prefix, pk=pk)
-    except AttributeError:
-        pass
+# Cached viewsets register their dependencies on import,
+# `UserViewSet` is cached with `cache_method` directly.
+register_cache_dependencies('user', User)
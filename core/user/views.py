@@ -7,6 +7,8 @@ from rest_framework.response import Response
 from components.user.mixins import UpdateRetrieveDestroyListUserMixin
 from components.user.constants import CACHE_TIMEOUT
 from components.general.caching.cache import cache_method
+from components.general.pagination import OptionalCursorPagination
+from components.general.sparse_fields import SparseFieldsetMixin
 
 from user.managers import (
     UserCreateManager,
@@ -17,11 +19,13 @@ from user.models import User
 from user import serializers
 
 
-class UserViewSet(UpdateRetrieveDestroyListUserMixin,
+class UserViewSet(SparseFieldsetMixin,
+                  UpdateRetrieveDestroyListUserMixin,
                   viewsets.GenericViewSet):
     queryset = User.objects.all()
     serializer_class = serializers.ListUserSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = OptionalCursorPagination
     serializers_map = {
         'update': serializers.UpdateUserSerializer,
         'partial_update': serializers.PartialUpdateUserSerializer,